@@ -0,0 +1,44 @@
+import importlib
+
+from .quickhull import Line, Point, PointArray, QuickHull
+
+# Everything beyond the core module is imported on first access, so
+# `import quickhull` stays cheap for short-lived worker processes and
+# optional dependencies (numpy, plotly) are only loaded when used.
+_LAZY = {
+    'orientation': 'predicates',
+    'InstrumentedQuickHull': 'instrumentation',
+    'QuickHullStats': 'instrumentation',
+    'TraceWriter': 'instrumentation',
+    'NumpyQuickHull': 'numpy_quickhull',
+    'ParallelQuickHull': 'parallel',
+    'batch_hull': 'batch',
+    'chunked_hull': 'chunked',
+    'OnlineHull': 'online',
+    'SlidingWindowHull': 'window',
+    'MonotoneChainHull': 'engines',
+    'ChanHull': 'engines',
+    'convex_hull': 'engines',
+    'select_engine': 'engines',
+    'HullIndex': 'query',
+    'HullCache': 'cache',
+    'ApproximateHull': 'approximate',
+    'area': 'metrics',
+    'perimeter': 'metrics',
+    'diameter': 'metrics',
+    'minimum_rectangle': 'metrics',
+    'batch_metrics': 'metrics',
+    'load_points': 'pointfile',
+    'write_points': 'pointfile',
+    'QuickHullAnimator': 'visualization',
+}
+
+__all__ = ['Line', 'Point', 'PointArray', 'QuickHull'] + sorted(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    value = getattr(importlib.import_module('.' + _LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
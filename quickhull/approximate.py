@@ -0,0 +1,69 @@
+import math
+from array import array
+
+import numpy as np
+
+from .engines import MonotoneChainHull
+from .quickhull import PointArray
+
+
+class ApproximateHull:
+    # Bentley-Faust-Preparata approximation. The x range is cut into
+    # strips no wider than epsilon; only the lowest and the highest point
+    # of every strip (plus the x extremes) go to monotone chain, which
+    # stays O(k log k) on the collinear runs strips tend to produce. Every
+    # input point then lies within one strip width of the result, which is
+    # the bound reported. One vectorized pass over the input, O(n + k).
+
+    def __init__(self, points, epsilon):
+        if epsilon <= 0:
+            raise ValueError('epsilon must be positive')
+        if not isinstance(points, PointArray):
+            points = PointArray.from_points(points)
+        self.points = points
+        self.epsilon = epsilon
+        self.indices = array('q')
+        self.hull_size = 0
+        self.bound = None
+
+    def hull(self):
+        return [self.points[i] for i in self.indices[:self.hull_size]]
+
+    def _candidates(self, xs, ys):
+        left, right = xs.min(), xs.max()
+        strips = max(math.ceil((right - left) / self.epsilon), 1)
+        if strips >= len(xs):
+            # Strips that narrow would keep about every point anyway.
+            self.bound = 0.0
+            return None
+        width = (right - left) / strips
+        self.bound = float(width)
+        strip = ((xs - left) / width).astype(np.intp) if width else np.zeros(len(xs), np.intp)
+        np.minimum(strip, strips - 1, out=strip)
+        lowest = np.full(strips, np.inf)
+        highest = np.full(strips, -np.inf)
+        np.minimum.at(lowest, strip, ys)
+        np.maximum.at(highest, strip, ys)
+        # Any point attaining its strip's extreme will do; strips without
+        # points keep -1 and are skipped.
+        chosen = np.full(2 * strips, -1, np.intp)
+        ids = np.arange(len(xs))
+        is_lowest = ys == lowest[strip]
+        chosen[strip[is_lowest]] = ids[is_lowest]
+        is_highest = ys == highest[strip]
+        chosen[strips + strip[is_highest]] = ids[is_highest]
+        chosen = np.concatenate((chosen[chosen >= 0], [xs.argmin(), xs.argmax()]))
+        return array('q', np.unique(chosen).astype(np.int64).tobytes())
+
+    def calculate(self):
+        if len(self.points) < 3:
+            self.indices = array('q', range(len(self.points)))
+            self.hull_size = len(self.points)
+            self.bound = 0.0
+            return
+        xs = np.asarray(self.points.xs, dtype=np.float64)
+        ys = np.asarray(self.points.ys, dtype=np.float64)
+        hull = MonotoneChainHull(self.points, indices=self._candidates(xs, ys))
+        hull.calculate()
+        self.indices = hull.indices
+        self.hull_size = hull.hull_size
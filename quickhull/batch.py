@@ -0,0 +1,65 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .quickhull import QuickHull, PointArray
+
+
+def _hull_sets(xs, ys, offsets, shift=0):
+    # One QuickHull is reused for every set, only its id range is reset.
+    hull = QuickHull(PointArray(xs, ys), indices=array('q'))
+    hull_offsets = array('q')
+    hull_indices = array('q')
+    for begin, end in zip(offsets, offsets[1:]):
+        hull.indices = array('q', range(begin - shift, end - shift))
+        hull.hull_size = 0
+        hull.calculate()
+        hull_indices.extend(hull.indices[:hull.hull_size])
+        hull_offsets.append(len(hull_indices))
+    if shift:
+        hull_indices = array('q', [index + shift for index in hull_indices])
+    return hull_offsets, hull_indices
+
+
+def _slice(values, begin, end):
+    if isinstance(values, array):
+        return values[begin:end]
+    return array('d', values[begin:end])
+
+
+def _chunk_offsets(offsets, chunk_size):
+    chunks = []
+    first = 0
+    for last in range(1, len(offsets)):
+        if offsets[last] - offsets[first] >= chunk_size or last == len(offsets) - 1:
+            chunks.append(offsets[first:last + 1])
+            first = last
+    return chunks
+
+
+def batch_hull(points, offsets, processes=None, chunk_size=65536):
+    if not isinstance(points, PointArray):
+        points = PointArray.from_points(points)
+    offsets = array('q', offsets)
+    processes = processes or os.cpu_count()
+    if processes == 1 or len(points) <= chunk_size:
+        hull_offsets, hull_indices = _hull_sets(points.xs, points.ys, offsets)
+        hull_offsets.insert(0, 0)
+        return hull_offsets, hull_indices
+
+    # Whole sets are grouped into chunks of roughly chunk_size points; each
+    # worker gets its chunk's coordinates and returns ids rebased to points.
+    chunks = _chunk_offsets(offsets, chunk_size)
+    with ProcessPoolExecutor(processes) as pool:
+        results = pool.map(_hull_sets,
+                           [_slice(points.xs, chunk[0], chunk[-1]) for chunk in chunks],
+                           [_slice(points.ys, chunk[0], chunk[-1]) for chunk in chunks],
+                           chunks,
+                           [chunk[0] for chunk in chunks])
+        hull_offsets = array('q', [0])
+        hull_indices = array('q')
+        for chunk_offsets, chunk_indices in results:
+            shift = len(hull_indices)
+            hull_offsets.extend(offset + shift for offset in chunk_offsets)
+            hull_indices.extend(chunk_indices)
+    return hull_offsets, hull_indices
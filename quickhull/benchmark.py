@@ -0,0 +1,178 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from .generator import DISTRIBUTIONS, TESTS, generate
+from .quickhull import QuickHull
+from .pointfile import read_text
+
+
+CORPORA = ('3', '10', '100', '1000', '100000')
+# Cold-start `import quickhull` must stay below this many seconds.
+IMPORT_BUDGET = 0.03
+
+
+def _engine(name):
+    if name == 'quickhull':
+        return QuickHull
+    if name == 'prefilter':
+        return lambda points: QuickHull(points, prefilter=True)
+    if name == 'numpy':
+        from .numpy_quickhull import NumpyQuickHull
+        return NumpyQuickHull
+    if name == 'parallel':
+        from .parallel import ParallelQuickHull
+        return ParallelQuickHull
+    if name in ('monotone_chain', 'chan'):
+        from .engines import ENGINES
+        return ENGINES[name]
+    if name == 'auto':
+        from .engines import ENGINES, select_engine
+        return lambda points: ENGINES[select_engine(points)](points)
+    raise ValueError('unknown engine: %s' % name)
+
+
+ENGINES = ('quickhull', 'prefilter', 'numpy', 'parallel', 'monotone_chain', 'chan', 'auto')
+
+
+def corpus_datasets(corpora, files):
+    for corpus in corpora:
+        paths = sorted(glob.glob(os.path.join(TESTS, corpus, '*.txt')),
+                       key=lambda path: int(os.path.basename(path)[:-4]))[:files]
+        for path in paths:
+            yield 'tests/%s/%s' % (corpus, os.path.basename(path)), \
+                lambda path=path: read_text(path)
+
+
+def generated_datasets(distributions, sizes, seed):
+    for name in distributions:
+        for size in sizes:
+            yield '%s/%d' % (name, size), lambda name=name, size=size: generate(name, size, seed)
+
+
+def _run(engine, points):
+    started = time.perf_counter()
+    hull = engine(points)
+    prepared = time.perf_counter()
+    hull.calculate()
+    finished = time.perf_counter()
+    return hull, prepared - started, finished - prepared
+
+
+def measure(engine_name, dataset, load, repeat):
+    engine = _engine(engine_name)
+    started = time.perf_counter()
+    points = load()
+    load_seconds = time.perf_counter() - started
+    prepare_seconds = hull_seconds = float('inf')
+    for _ in range(repeat):
+        hull, prepare, calculate = _run(engine, points)
+        prepare_seconds = min(prepare_seconds, prepare)
+        hull_seconds = min(hull_seconds, calculate)
+    # Memory is measured on a separate run so tracing does not skew timings.
+    tracemalloc.start()
+    try:
+        _run(engine, points)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'dataset': dataset,
+        'engine': engine_name,
+        'points': len(points),
+        'hull_size': hull.hull_size,
+        'seconds': {'load': load_seconds, 'prepare': prepare_seconds, 'hull': hull_seconds},
+        'points_per_second': len(points) / max(prepare_seconds + hull_seconds, 1e-9),
+        'peak_memory': peak_memory,
+    }
+
+
+def measure_import(module='quickhull', repeat=5):
+    # Cumulative time -X importtime reports for the package in a fresh
+    # interpreter, best of repeat runs.
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best = float('inf')
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                                   cwd=root, capture_output=True, text=True, check=True)
+        for line in completed.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                best = min(best, int(fields[1]) / 1e6)
+    return best
+
+
+def compare(results, baseline, tolerance):
+    previous = {(result['dataset'], result['engine']): result for result in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        old = previous.get((result['dataset'], result['engine']))
+        if old and result['points_per_second'] < old['points_per_second'] * (1 - tolerance):
+            regressions.append((result, old))
+    return regressions
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Benchmark the hull engines.')
+    parser.add_argument('--engines', nargs='+', default=['quickhull'], choices=ENGINES)
+    parser.add_argument('--corpora', nargs='*', default=list(CORPORA))
+    parser.add_argument('--files', type=int, default=5, help='files per corpus')
+    parser.add_argument('--distributions', nargs='*', default=list(DISTRIBUTIONS),
+                        choices=list(DISTRIBUTIONS))
+    parser.add_argument('--sizes', nargs='*', type=int, default=[1000, 100000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='allowed relative throughput drop before flagging')
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET,
+                        help='seconds allowed for a cold `import quickhull`')
+    options = parser.parse_args(arguments)
+
+    datasets = list(corpus_datasets(options.corpora, options.files)) + \
+        list(generated_datasets(options.distributions, options.sizes, options.seed))
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'import_seconds': measure_import(),
+        'results': [],
+    }
+    print('import quickhull %27.1f ms (budget %.1f ms)' % (
+        1000 * results['import_seconds'], 1000 * options.import_budget))
+    for dataset, load in datasets:
+        for engine in options.engines:
+            result = measure(engine, dataset, load, options.repeat)
+            results['results'].append(result)
+            print('%-24s %-10s %9d points %7d hull %12.0f points/s %10d bytes' % (
+                dataset, engine, result['points'], result['hull_size'],
+                result['points_per_second'], result['peak_memory']))
+
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    status = 0
+    if results['import_seconds'] > options.import_budget:
+        print('IMPORT BUDGET EXCEEDED: %.1f ms' % (1000 * results['import_seconds']))
+        status = 1
+    if options.compare:
+        with open(options.compare) as input:
+            regressions = compare(results, json.load(input), options.tolerance)
+        for result, old in regressions:
+            print('REGRESSION %s %s: %.0f -> %.0f points/s' % (
+                result['dataset'], result['engine'],
+                old['points_per_second'], result['points_per_second']))
+        if regressions:
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
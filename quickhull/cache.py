@@ -0,0 +1,108 @@
+from array import array
+from collections import Counter, OrderedDict
+from hashlib import blake2b
+
+from .quickhull import QuickHull, PointArray
+
+# Bookkeeping charged to every entry on top of its vertex ids.
+_ENTRY_OVERHEAD = 128
+
+
+def _digest(points, length):
+    key = blake2b(digest_size=16)
+    for values in (points.xs, points.ys):
+        view = memoryview(values)
+        key.update(view.format.encode())
+        key.update(view[:length])
+    return key.digest()
+
+
+class CacheStats:
+
+    def __init__(self):
+        self.hits = 0
+        self.prefix_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def as_dict(self):
+        return {
+            'hits': self.hits,
+            'prefix_hits': self.prefix_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class HullCache:
+    # Hull vertex ids keyed by a hash of the coordinate buffers. A request
+    # that extends a cached set only runs the engine over the cached hull
+    # plus the appended points, since hull(A + B) == hull(hull(A) + B) and
+    # the ids of a prefix stay valid in the longer set.
+    prefix_candidates = 8
+
+    def __init__(self, max_entries=1024, max_bytes=64 << 20, engine=QuickHull):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.engine = engine
+        self.entries = OrderedDict()
+        self.lengths = Counter()
+        self.size = 0
+        self.stats = CacheStats()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _store(self, key, length, ids):
+        self.entries[key] = (length, ids)
+        self.lengths[length] += 1
+        self.size += _ENTRY_OVERHEAD + ids.itemsize * len(ids)
+        while self.entries and (len(self.entries) > self.max_entries or
+                                self.size > self.max_bytes):
+            _, (length, ids) = self.entries.popitem(last=False)
+            self.lengths[length] -= 1
+            if not self.lengths[length]:
+                del self.lengths[length]
+            self.size -= _ENTRY_OVERHEAD + ids.itemsize * len(ids)
+            self.stats.evictions += 1
+
+    def _find_prefix(self, points, length):
+        shorter = sorted((n for n in self.lengths if n < length), reverse=True)
+        for n in shorter[:self.prefix_candidates]:
+            key = _digest(points, n)
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry
+        return None
+
+    def hull_indices(self, points):
+        if not isinstance(points, PointArray):
+            points = PointArray.from_points(points)
+        length = len(points)
+        key = _digest(points, length)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.stats.hits += 1
+            # Callers get their own copy; the cached ids must not change.
+            return array('q', entry[1])
+        entry = self._find_prefix(points, length)
+        if entry is not None:
+            prefix_length, prefix_ids = entry
+            self.stats.prefix_hits += 1
+            indices = array('q', prefix_ids)
+            indices.extend(range(prefix_length, length))
+        else:
+            self.stats.misses += 1
+            indices = None
+        hull = self.engine(points, indices=indices)
+        hull.calculate()
+        ids = array('q', hull.indices[:hull.hull_size])
+        self._store(key, length, ids)
+        return array('q', ids)
+
+    def hull(self, points):
+        if not isinstance(points, PointArray):
+            points = PointArray.from_points(points)
+        return [points[i] for i in self.hull_indices(points)]
@@ -0,0 +1,23 @@
+from array import array
+
+from .quickhull import QuickHull, PointArray
+from .pointfile import read_chunks
+
+
+def _merge(union, chunk, prefilter):
+    points = PointArray(array('d', chunk.xs) + union.xs,
+                        array('d', chunk.ys) + union.ys)
+    hull = QuickHull(points, prefilter=prefilter)
+    hull.calculate()
+    hull_indices = hull.indices[:hull.hull_size]
+    return PointArray(array('d', [points.xs[i] for i in hull_indices]),
+                      array('d', [points.ys[i] for i in hull_indices]))
+
+
+def chunked_hull(path, chunk_size=1000000, prefilter=True):
+    # Only one chunk and the hull vertices seen so far are held in memory;
+    # each chunk is merged into the running hull as soon as it is read.
+    union = PointArray()
+    for chunk in read_chunks(path, chunk_size):
+        union = _merge(union, chunk, prefilter)
+    return union[:]
@@ -0,0 +1,183 @@
+from array import array
+
+from .predicates import orientation
+from .quickhull import QuickHull, PointArray
+
+
+def _chain(xs, ys, ids):
+    # Andrew's monotone chain over ids sorted by (x, y). Returns the hull
+    # counter-clockwise from the leftmost point, collinear points dropped.
+    if len(ids) < 3:
+        return list(ids)
+    lower = []
+    for point in ids:
+        x, y = xs[point], ys[point]
+        while len(lower) >= 2 and orientation(
+                xs[lower[-2]], ys[lower[-2]], xs[lower[-1]], ys[lower[-1]], x, y) <= 0:
+            lower.pop()
+        lower.append(point)
+    upper = []
+    for point in reversed(ids):
+        x, y = xs[point], ys[point]
+        while len(upper) >= 2 and orientation(
+                xs[upper[-2]], ys[upper[-2]], xs[upper[-1]], ys[upper[-1]], x, y) <= 0:
+            upper.pop()
+        upper.append(point)
+    return lower[:-1] + upper[:-1]
+
+
+def _rotate_to_lowest(xs, ys, vertices):
+    # QuickHull order: counter-clockwise, starting at the lowest point.
+    lowest = min(range(len(vertices)), key=lambda i: (ys[vertices[i]], xs[vertices[i]]))
+    return vertices[lowest:] + vertices[:lowest]
+
+
+class MonotoneChainHull:
+    # O(n log n) regardless of the hull size, so it does not degrade on
+    # inputs where most points lie on the hull.
+
+    def __init__(self, points, indices=None):
+        if not isinstance(points, PointArray):
+            points = PointArray.from_points(points)
+        self.points = points
+        if indices is None:
+            indices = array('q', range(len(points)))
+        self.indices = indices
+        self.hull_size = 0
+
+    def hull(self):
+        return [self.points[i] for i in self.indices[:self.hull_size]]
+
+    def _set_hull(self, vertices):
+        # Hull ids first, the remaining ids keep their relative order.
+        on_hull = set(vertices)
+        self.indices = array('q', vertices) + \
+            array('q', [i for i in self.indices if i not in on_hull])
+        self.hull_size = len(vertices)
+
+    def calculate(self):
+        if len(self.indices) < 3:
+            self.hull_size = len(self.indices)
+            return
+        xs, ys = self.points.xs, self.points.ys
+        ids = sorted(self.indices, key=lambda i: (xs[i], ys[i]))
+        self._set_hull(_rotate_to_lowest(xs, ys, _chain(xs, ys, ids)))
+
+
+class ChanHull(MonotoneChainHull):
+    # Chan's algorithm: monotone chain hulls of groups of m points, then a
+    # Jarvis march over the group hulls, squaring m until h <= m. That is
+    # O(n log h), output-sensitive where monotone chain is not.
+
+    def _farther(self, px, py, a, b):
+        xs, ys = self.points.xs, self.points.ys
+        return (xs[b] - px) ** 2 + (ys[b] - py) ** 2 > (xs[a] - px) ** 2 + (ys[a] - py) ** 2
+
+    def _better(self, px, py, best, candidate):
+        xs, ys = self.points.xs, self.points.ys
+        turn = orientation(px, py, xs[best], ys[best], xs[candidate], ys[candidate])
+        return turn < 0 or turn == 0 and self._farther(px, py, best, candidate)
+
+    def _tangent(self, group, start, px, py):
+        # The tangent point only ever moves counter-clockwise while the march
+        # goes around, so walking on from the previous one costs O(1)
+        # amortised per step instead of a binary search.
+        xs, ys = self.points.xs, self.points.ys
+        j = start
+        for _ in range(len(group)):
+            current, following = group[j], group[(j + 1) % len(group)]
+            if (xs[current], ys[current]) != (px, py) and \
+                    not self._better(px, py, current, following):
+                break
+            j = (j + 1) % len(group)
+        return j
+
+    def _first_tangent(self, group, px, py):
+        xs, ys = self.points.xs, self.points.ys
+        best = None
+        for j, candidate in enumerate(group):
+            if (xs[candidate], ys[candidate]) == (px, py):
+                continue
+            if best is None or self._better(px, py, group[best], candidate):
+                best = j
+        return best or 0
+
+    def _wrap(self, groups, start, limit):
+        xs, ys = self.points.xs, self.points.ys
+        tangents = [self._first_tangent(group, xs[start], ys[start]) for group in groups]
+        vertices = [start]
+        point = start
+        for _ in range(limit):
+            px, py = xs[point], ys[point]
+            best = None
+            for k, group in enumerate(groups):
+                tangents[k] = self._tangent(group, tangents[k], px, py)
+                candidate = group[tangents[k]]
+                if (xs[candidate], ys[candidate]) == (px, py):
+                    continue
+                if best is None or self._better(px, py, best, candidate):
+                    best = candidate
+            if best is None or (xs[best], ys[best]) == (xs[start], ys[start]):
+                return vertices
+            vertices.append(best)
+            point = best
+        return None
+
+    def calculate(self):
+        length = len(self.indices)
+        if length < 3:
+            self.hull_size = length
+            return
+        xs, ys = self.points.xs, self.points.ys
+        start = min(self.indices, key=lambda i: (ys[i], xs[i]))
+        m = 4
+        while True:
+            m = min(m * m, length)
+            groups = []
+            for begin in range(0, length, m):
+                ids = sorted(self.indices[begin:begin + m], key=lambda i: (xs[i], ys[i]))
+                groups.append(_chain(xs, ys, ids))
+            vertices = self._wrap(groups, start, m)
+            if vertices is not None:
+                break
+        self._set_hull(vertices)
+
+
+ENGINES = {
+    'quickhull': QuickHull,
+    'monotone_chain': MonotoneChainHull,
+    'chan': ChanHull,
+}
+
+SMALL_INPUT = 1024
+SAMPLE_SIZE = 512
+# Above this share of sampled points on the hull QuickHull falls behind
+# monotone chain. Chan's algorithm measured slower than both on every
+# distribution in benchmark.py, so it is only run when asked for by name.
+HULL_HEAVY = 0.1
+
+
+def estimate_hull_fraction(points, sample_size=SAMPLE_SIZE):
+    # Share of an evenly strided sample that lies on the sample's own hull.
+    # Circular or otherwise hull-heavy inputs come out close to one.
+    stride = max(len(points) // sample_size, 1)
+    xs, ys = points.xs, points.ys
+    ids = sorted(range(0, len(points), stride), key=lambda i: (xs[i], ys[i]))
+    return len(_chain(xs, ys, ids)) / len(ids)
+
+
+def select_engine(points):
+    if len(points) < SMALL_INPUT:
+        return 'quickhull'
+    if estimate_hull_fraction(points) > HULL_HEAVY:
+        return 'monotone_chain'
+    return 'quickhull'
+
+
+def convex_hull(points, engine=None):
+    # Runs the named engine, or the one select_engine picks for the input.
+    if not isinstance(points, PointArray):
+        points = PointArray.from_points(points)
+    hull = ENGINES[engine or select_engine(points)](points)
+    hull.calculate()
+    return hull
@@ -1,25 +1,128 @@
-from random import randint
+import argparse
 import os
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 
-def ensure_dir(file_path):
-    directory = os.path.dirname(file_path)
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-
-def gen_size(size):
-    for t in range(100):
-        path = "tests/" + str(size) + "/" + str(t) + ".txt"
-        ensure_dir(path)
-        f = open(path, 'w')
-        f.writelines(str(size) + '\n')
-        for i in range(size):
-            f.writelines(str(randint(-100000, 100000)) + '\n')
-        f.close()
-
-
-gen_size(3)
-gen_size(10)
-gen_size(100)
-gen_size(1000)
-gen_size(100000)
-gen_size(10000000)
+import numpy as np
+
+from .pointfile import EXTENSION, write_points
+from .quickhull import PointArray
+
+RANGE = 100000
+# The corpus benchmark.py reads, inside the package wherever this runs from.
+TESTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests')
+
+
+def uniform_square(size, rng):
+    return rng.integers(-RANGE, RANGE, (2, size), endpoint=True)
+
+
+def uniform_disk(size, rng):
+    radius = RANGE * np.sqrt(rng.random(size))
+    angle = rng.uniform(0, 2 * np.pi, size)
+    return radius * np.cos(angle), radius * np.sin(angle)
+
+
+def gaussian(size, rng):
+    return rng.normal(0, RANGE / 3, (2, size))
+
+
+def circle(size, rng):
+    angle = rng.uniform(0, 2 * np.pi, size)
+    return RANGE * np.cos(angle), RANGE * np.sin(angle)
+
+
+def clustered(size, rng):
+    centres = rng.uniform(-RANGE, RANGE, (2, 16))
+    cluster = rng.integers(0, 16, size)
+    spread = rng.normal(0, RANGE / 50, (2, size))
+    return centres[0, cluster] + spread[0], centres[1, cluster] + spread[1]
+
+
+def collinear(size, rng):
+    xs = rng.integers(-RANGE, RANGE, size, endpoint=True) // 2
+    return xs, 2 * xs
+
+
+def duplicates(size, rng):
+    pool = rng.integers(-RANGE, RANGE, (2, 16), endpoint=True)
+    choice = rng.integers(0, 16, size)
+    return pool[0, choice], pool[1, choice]
+
+
+DISTRIBUTIONS = {
+    'uniform_square': uniform_square,
+    'uniform_disk': uniform_disk,
+    'gaussian': gaussian,
+    'circle': circle,
+    'clustered': clustered,
+    'collinear': collinear,
+    'duplicates': duplicates,
+}
+
+
+def generate(distribution, size, seed=0, trial=0):
+    # The same (distribution, size, seed, trial) always gives the same
+    # points, whichever process generates them. Integer distributions come
+    # back as 'q' columns, the others as 'd'.
+    rng = np.random.default_rng([seed, trial, size, zlib.crc32(distribution.encode())])
+    xs, ys = DISTRIBUTIONS[distribution](size, rng)
+    typecode = 'q' if xs.dtype.kind == 'i' else 'd'
+    dtype = np.int64 if typecode == 'q' else np.float64
+    return PointArray(array(typecode, np.ascontiguousarray(xs, dtype).tobytes()),
+                      array(typecode, np.ascontiguousarray(ys, dtype).tobytes()))
+
+
+def write_text(path, points, chunk_size=1 << 20):
+    # A count line followed by one "x y" line per point. %r keeps floats
+    # exact with the shortest round-tripping representation.
+    line = '%d %d\n' if points.xs.typecode == 'q' else '%r %r\n'
+    with open(path, 'w') as output:
+        output.write('%d\n' % len(points))
+        for begin in range(0, len(points), chunk_size):
+            pairs = zip(points.xs[begin:begin + chunk_size].tolist(),
+                        points.ys[begin:begin + chunk_size].tolist())
+            output.write(''.join(map(line.__mod__, pairs)))
+
+
+def _write_trial(task):
+    path, distribution, size, seed, trial, binary = task
+    points = generate(distribution, size, seed, trial)
+    if binary:
+        write_points(path, points, points.xs.typecode)
+    else:
+        write_text(path, points)
+    return path
+
+
+def gen_size(size, trials=100, distribution='uniform_square', seed=0, binary=False,
+             directory=TESTS, processes=None):
+    # Writes directory/<size>/<trial>.txt (or .qhp), one trial per process.
+    target = os.path.join(directory, str(size))
+    os.makedirs(target, exist_ok=True)
+    extension = EXTENSION if binary else '.txt'
+    tasks = [(os.path.join(target, str(trial) + extension), distribution, size, seed, trial, binary)
+             for trial in range(trials)]
+    with ProcessPoolExecutor(processes) as executor:
+        return list(executor.map(_write_trial, tasks))
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Generate point sets for the hull engines.')
+    parser.add_argument('--sizes', nargs='+', type=int,
+                        default=[3, 10, 100, 1000, 100000, 10000000])
+    parser.add_argument('--trials', type=int, default=100)
+    parser.add_argument('--distribution', default='uniform_square', choices=list(DISTRIBUTIONS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--binary', action='store_true', help='write %s files' % EXTENSION)
+    parser.add_argument('--directory', default=TESTS)
+    parser.add_argument('--processes', type=int)
+    options = parser.parse_args(arguments)
+    for size in options.sizes:
+        gen_size(size, options.trials, options.distribution, options.seed,
+                 options.binary, options.directory, options.processes)
+
+
+if __name__ == '__main__':
+    main()
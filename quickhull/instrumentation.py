@@ -0,0 +1,206 @@
+import json
+import time
+from collections import Counter
+
+from . import predicates
+from .quickhull import QuickHull
+
+_SPLIT, _MERGE, _CLOSE = range(3)
+
+
+class QuickHullStats:
+
+    def __init__(self):
+        self.orientation_tests = 0
+        self.swaps = 0
+        self.prefiltered = 0
+        self.exact_orientation_tests = 0
+        self.depths = Counter()
+        self.discarded = Counter()
+        self.seconds = Counter()
+
+    def as_dict(self):
+        return {
+            'orientation_tests': self.orientation_tests,
+            'swaps': self.swaps,
+            'prefiltered': self.prefiltered,
+            'exact_orientation_tests': self.exact_orientation_tests,
+            'depth_histogram': dict(sorted(self.depths.items())),
+            'discarded_per_level': dict(sorted(self.discarded.items())),
+            'seconds': dict(self.seconds),
+        }
+
+    def write(self, output):
+        json.dump(self.as_dict(), output)
+        output.write('\n')
+
+
+class TraceWriter:
+
+    def __init__(self, output):
+        self.output = output
+
+    def _write(self, event, **fields):
+        fields['event'] = event
+        self.output.write(json.dumps(fields) + '\n')
+
+    def add_to_hull(self, begin, end):
+        self._write('add_to_hull', begin=(begin.x, begin.y), end=(end.x, end.y))
+
+    def add_line(self, begin, end, comment):
+        self._write('add_line', begin=(begin.x, begin.y), end=(end.x, end.y), comment=comment)
+
+    def remove_line(self, begin, end, comment):
+        self._write('remove_line', begin=(begin.x, begin.y), end=(end.x, end.y), comment=comment)
+
+    def select_points(self, points, comment):
+        self._write('select_points', count=len(points), comment=comment)
+
+    def deselect_points(self):
+        self._write('deselect_points')
+
+
+class InstrumentedQuickHull(QuickHull):
+    # QuickHull itself carries no hooks at all; this subclass re-implements
+    # the hot paths with counters, stage timers and handler callbacks.
+
+    def __init__(self, points, handler=None, stats=None, *, indices=None, prefilter=False):
+        QuickHull.__init__(self, points, indices=indices, prefilter=prefilter)
+        self.handler = handler
+        self.stats = QuickHullStats() if stats is None else stats
+
+    def _stream(self):
+        exact = predicates.stats.exact
+        try:
+            yield from QuickHull._stream(self)
+        finally:
+            self.stats.exact_orientation_tests += predicates.stats.exact - exact
+
+    def _timed(self, stage, method, *arguments):
+        started = time.perf_counter()
+        try:
+            return method(self, *arguments)
+        finally:
+            self.stats.seconds[stage] += time.perf_counter() - started
+
+    def _timed_steps(self, stage, steps):
+        # Only the time spent inside the generator counts, not the time the
+        # consumer holds on to each yielded value.
+        while True:
+            started = time.perf_counter()
+            try:
+                step = next(steps)
+            except StopIteration:
+                return
+            finally:
+                self.stats.seconds[stage] += time.perf_counter() - started
+            yield step
+
+    def _add_to_hull(self, begin, end):
+        if self.handler:
+            self.handler.add_to_hull(self.points[begin], self.points[end])
+
+    def _add_line(self, start, finish, comment):
+        if self.handler:
+            self.handler.add_line(self.points[start], self.points[finish], comment)
+
+    def _remove_line(self, start, finish, comment):
+        if self.handler:
+            self.handler.remove_line(self.points[start], self.points[finish], comment)
+
+    def _select_points(self, begin, end, comment):
+        if self.handler:
+            self.handler.select_points(
+                [self.points[i] for i in self.indices[begin:end+1]], comment)
+
+    def _deselect_points(self):
+        if self.handler:
+            self.handler.deselect_points()
+
+    def _swap(self, i, j):
+        self.stats.swaps += 1
+        QuickHull._swap(self, i, j)
+
+    def _add_point_to_hull(self, point_index):
+        hull_index = QuickHull._add_point_to_hull(self, point_index)
+        if hull_index != 0:
+            self._add_to_hull(self.indices[hull_index - 1], self.indices[hull_index])
+        return hull_index
+
+    def _discard_interior_points(self):
+        self._timed('prefilter', QuickHull._discard_interior_points)
+        self.stats.prefiltered += self.discarded
+
+    def _find_lowest_point(self):
+        return self._timed('lowest', QuickHull._find_lowest_point)
+
+    def _find_nearest_point(self, point):
+        nearest = self._timed('nearest', QuickHull._find_nearest_point, point)
+        self.stats.orientation_tests += max(len(self.indices) - 2, 0)
+        self._add_to_hull(self.indices[point], self.indices[nearest])
+        return nearest
+
+    def _find_furthest_point(self, begin, end, line):
+        self.stats.orientation_tests += end - begin + 1
+        return QuickHull._find_furthest_point(self, begin, end, line)
+
+    def _split(self, begin, end, line):
+        # The counts follow from what the partition moved. Every position
+        # is tested once; a swap leaves a different id in a position left of
+        # the partition, and the partition point itself is tested from both
+        # sides unless a swap put it there.
+        before = self.indices[begin:end + 1]
+        partition = QuickHull._split(self, begin, end, line)
+        indices = self.indices
+        swaps = sum(1 for i in range(begin, partition) if indices[i] != before[i - begin])
+        tests = end - begin + 1
+        if partition <= end and indices[partition] == before[partition - begin]:
+            tests += 1
+        self.stats.orientation_tests += tests
+        self.stats.swaps += swaps
+        return partition
+
+    def _calculate(self, begin, end, line):
+        return self._timed_steps('recursion', self._trace_calculate(begin, end, line))
+
+    def _trace_calculate(self, begin, end, line):
+        indices = self.indices
+        stats = self.stats
+        stack = [(_SPLIT, begin, end, line, None, 0)]
+        while stack:
+            kind, begin, end, line, furthest, depth = stack.pop()
+            if kind == _SPLIT:
+                if begin > end:
+                    continue
+                stats.depths[depth] += 1
+                self._select_points(begin, end, "Selecting points range")
+                self._add_line(line[0], line[1], "Split into two parts (depending on line).")
+                furthest_point_index = self._find_furthest_point(begin, end, line)
+                furthest = indices[furthest_point_index]
+                first_line = (line[0], furthest)
+                self._add_line(first_line[0], first_line[1], "Find furthest point and draw new two lines.")
+                self._add_line(furthest, line[1], "Find furthest point and draw new two lines.")
+                self._remove_line(line[0], line[1], "Split into two parts (depending on line).")
+                self._deselect_points()
+
+                self._swap(furthest_point_index, end)
+
+                partition = self._split(begin, end - 1, first_line)
+                stack.append((_MERGE, partition, end, line, furthest, depth))
+                stack.append((_SPLIT, begin, partition - 1, first_line, None, depth + 1))
+            elif kind == _MERGE:
+                partition = begin
+                self._remove_line(line[0], furthest, "")
+
+                self._swap(end, partition)
+                yield self._add_point_to_hull(partition)
+
+                second_line = (furthest, line[1])
+                second_partition = self._split(partition + 1, end, second_line)
+                # Whatever is left of the range after the second split lies
+                # inside the triangle and is dropped at this level.
+                stats.discarded[depth] += end - second_partition + 1
+                stack.append((_CLOSE, 0, 0, second_line, None, depth))
+                stack.append((_SPLIT, partition + 1, second_partition - 1, second_line, None, depth + 1))
+            else:
+                self._remove_line(line[0], line[1], "")
@@ -0,0 +1,57 @@
+import argparse
+import asyncio
+import json
+import time
+
+from .generator import DISTRIBUTIONS, generate
+from .service import HullClient
+
+
+async def _worker(client, datasets, requests, latencies):
+    for i in range(requests):
+        started = time.perf_counter()
+        await client.hull_indices(datasets[i % len(datasets)])
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(options):
+    datasets = [generate(options.distribution, options.size, options.seed, trial)
+                for trial in range(options.datasets)]
+    clients = [await HullClient().connect(options.host, options.port, options.path)
+               for _ in range(options.connections)]
+    latencies = []
+    per_worker = options.requests // options.concurrency
+    started = time.perf_counter()
+    await asyncio.gather(*[_worker(clients[i % len(clients)], datasets, per_worker, latencies)
+                           for i in range(options.concurrency)])
+    elapsed = time.perf_counter() - started
+    metrics = await clients[0].metrics()
+    for client in clients:
+        await client.close()
+
+    latencies.sort()
+    print('%d requests in %.2f s, %.0f requests/s' % (
+        len(latencies), elapsed, len(latencies) / elapsed))
+    for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+        print('%s latency %.2f ms' % (name, 1000 * latencies[min(int(fraction * len(latencies)),
+                                                                  len(latencies) - 1)]))
+    print('server metrics: %s' % json.dumps(metrics))
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Send concurrent hull requests to service.py.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--path', help='connect to this Unix socket instead')
+    parser.add_argument('--connections', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, default=64, help='requests in flight')
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--size', type=int, default=100, help='points per request')
+    parser.add_argument('--distribution', default='uniform_square', choices=list(DISTRIBUTIONS))
+    parser.add_argument('--datasets', type=int, default=16, help='distinct point sets to cycle')
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(run(parser.parse_args(arguments)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+import math
+
+from .quickhull import Point, PointArray
+
+# Measurements of a computed hull. Vertices are expected in QuickHull
+# order: counter-clockwise, as returned by hull() or the points behind
+# indices[:hull_size], or NumpyQuickHull's (h, 2) array. Every function
+# is a single pass, O(h).
+
+
+def _coordinates(vertices):
+    if not isinstance(vertices, PointArray):
+        vertices = PointArray.from_points(vertices)
+    return vertices.xs, vertices.ys
+
+
+def area(vertices):
+    # Shoelace formula, taken relative to the first vertex to keep the
+    # cross products small.
+    xs, ys = _coordinates(vertices)
+    if len(xs) < 3:
+        return 0.0
+    x0, y0 = xs[0], ys[0]
+    return math.fsum((xs[i] - x0) * (ys[i + 1] - y0) - (xs[i + 1] - x0) * (ys[i] - y0)
+                     for i in range(1, len(xs) - 1)) / 2
+
+
+def perimeter(vertices):
+    xs, ys = _coordinates(vertices)
+    size = len(xs)
+    if size < 2:
+        return 0.0
+    return math.fsum(math.hypot(xs[(i + 1) % size] - xs[i], ys[(i + 1) % size] - ys[i])
+                     for i in range(size))
+
+
+def _distinct(xs, ys):
+    # Positions of the vertices that differ from the one before; QuickHull
+    # repeats the lowest point at the end when the input holds it twice.
+    keep = [i for i in range(len(xs)) if i == 0 or (xs[i], ys[i]) != (xs[i - 1], ys[i - 1])]
+    while len(keep) > 1 and (xs[keep[-1]], ys[keep[-1]]) == (xs[0], ys[0]):
+        keep.pop()
+    return keep
+
+
+def diameter(vertices):
+    # Farthest pair as (distance, i, j). Rotating calipers: for every edge
+    # the vertex furthest from its line only moves forward, so all
+    # antipodal pairs are visited in one lap.
+    xs, ys = _coordinates(vertices)
+    if not len(xs):
+        raise ValueError('empty hull has no diameter')
+    keep = _distinct(xs, ys)
+    xs, ys = [xs[i] for i in keep], [ys[i] for i in keep]
+    size = len(keep)
+
+    def height(i, j):
+        # Twice the area of the triangle edge i makes with vertex j.
+        k = (i + 1) % size
+        return (xs[k] - xs[i]) * (ys[j] - ys[i]) - (ys[k] - ys[i]) * (xs[j] - xs[i])
+
+    best = [0.0, 0, 0]
+
+    def consider(i, j):
+        distance = math.hypot(xs[j] - xs[i], ys[j] - ys[i])
+        if distance > best[0]:
+            best[:] = distance, min(i, j), max(i, j)
+
+    j = 1 % size
+    for i in range(size):
+        while height(i, (j + 1) % size) > height(i, j):
+            j = (j + 1) % size
+        consider(i, j)
+        consider((i + 1) % size, j)
+    # Hulls on a single line have no width for the calipers to measure;
+    # their diameter runs between the extremes along the first edge.
+    ux, uy = xs[1 % size] - xs[0], ys[1 % size] - ys[0]
+    along = [x * ux + y * uy for x, y in zip(xs, ys)]
+    consider(along.index(min(along)), along.index(max(along)))
+    distance, i, j = best
+    return distance, keep[i], keep[j]
+
+
+def minimum_rectangle(vertices):
+    # Minimum-area enclosing rectangle as (area, corners), corners being
+    # four Points counter-clockwise. One of its sides lies on a hull edge;
+    # for each edge three calipers track the vertices furthest along the
+    # edge, away from it and against it, each advancing monotonically.
+    xs, ys = _coordinates(vertices)
+    if not len(xs):
+        raise ValueError('empty hull has no bounding rectangle')
+    keep = _distinct(xs, ys)
+    xs, ys = [xs[i] for i in keep], [ys[i] for i in keep]
+    size = len(keep)
+    if size == 1:
+        return 0.0, [Point(xs[0], ys[0]) for _ in range(4)]
+
+    def dot(j, ux, uy):
+        return xs[j % size] * ux + ys[j % size] * uy
+
+    best = None
+    right = top = left = 0
+    for i in range(size):
+        ex, ey = xs[(i + 1) % size] - xs[i], ys[(i + 1) % size] - ys[i]
+        length = math.hypot(ex, ey)
+        ux, uy = ex / length, ey / length
+        # Pointers count laps instead of wrapping, so none falls behind.
+        right = max(right, i + 1)
+        while dot(right + 1, ux, uy) > dot(right, ux, uy):
+            right += 1
+        top = max(top, right)
+        while dot(top + 1, -uy, ux) > dot(top, -uy, ux):
+            top += 1
+        left = max(left, top)
+        while dot(left + 1, -ux, -uy) > dot(left, -ux, -uy):
+            left += 1
+        low, high = dot(left, ux, uy), dot(right, ux, uy)
+        base = dot(i, -uy, ux)
+        # Measured from the edge itself, so a vertex on its line is at 0.
+        height = (ex * (ys[top % size] - ys[i]) - ey * (xs[top % size] - xs[i])) / length
+        rectangle = (high - low) * height
+        if best is None or rectangle < best[0]:
+            best = (rectangle, ux, uy, low, high, base, height)
+
+    rectangle, ux, uy, low, high, base, height = best
+    # Back from (along, across) the edge to x and y.
+    corners = [Point(along * ux - across * uy, along * uy + across * ux)
+               for along, across in ((low, base), (high, base),
+                                     (high, base + height), (low, base + height))]
+    return max(rectangle, 0.0), corners
+
+
+def batch_metrics(points, hull_offsets, hull_indices):
+    # Area, perimeter, diameter and minimum rectangle area of many hulls at
+    # once, vectorized with numpy, for the (hull_offsets, hull_indices) pair
+    # batch_hull returns; hull k is
+    # points[hull_indices[hull_offsets[k]:hull_offsets[k + 1]]]. Returns
+    # four arrays, in that order.
+    import numpy as np
+
+    if not isinstance(points, PointArray):
+        points = PointArray.from_points(points)
+    offsets = np.asarray(hull_offsets, dtype=np.intp)
+    indices = np.asarray(hull_indices, dtype=np.intp)
+    sizes = np.diff(offsets)
+    count = len(sizes)
+    if not len(indices):
+        return tuple(np.zeros(count) for _ in range(4))
+    xs = np.asarray(points.xs, dtype=float)[indices]
+    ys = np.asarray(points.ys, dtype=float)[indices]
+    nonempty = sizes > 0
+
+    def per_hull(reduce, values, empty=0.0):
+        result = np.full(count, empty)
+        result[nonempty] = reduce.reduceat(values, offsets[:-1][nonempty])
+        return result
+
+    # Hull of every position, its hull's first position, and the position
+    # of its successor, wrapping the last vertex of each hull back round.
+    hull = np.repeat(np.arange(count), sizes)
+    first = offsets[:-1][hull]
+    size = sizes[hull]
+    positions = np.arange(len(indices))
+
+    def step(position, steps):
+        return first + (position - first + steps) % size
+
+    following = step(positions, 1)
+    dx, dy = xs - xs[first], ys - ys[first]
+    areas = per_hull(np.add, dx * dy[following] - dx[following] * dy) / 2
+    ex, ey = xs[following] - xs, ys[following] - ys
+    lengths = np.hypot(ex, ey)
+    perimeters = per_hull(np.add, lengths)
+
+    # Edge angles increase over [0, 2 pi) within a hull (see HullIndex), so
+    # offset by eight times the hull number they are sorted batch-wide, and
+    # every caliper is a bisection, checked against both neighbours.
+    # A repeated vertex leaves an edge of no length and angle 0; the running
+    # maximum gives it the angle of the edge before instead.
+    keys = np.maximum.accumulate(hull * 8 + np.arctan2(ey, ex) % (2 * np.pi))
+
+    def extreme(ux, uy):
+        # Position of the vertex furthest in direction (ux, uy) in each
+        # edge's hull.
+        targets = hull * 8 + (np.arctan2(uy, ux) + np.pi / 2) % (2 * np.pi)
+        found = step(np.searchsorted(keys, targets), 0)
+        candidates = np.stack([step(found, -1), found, step(found, 1)])
+        dots = xs[candidates] * ux + ys[candidates] * uy
+        return candidates[np.argmax(dots, axis=0), positions]
+
+    # Rotating calipers: the diameter is between an edge endpoint and the
+    # vertex furthest from the edge, or one of its neighbours on ties; for
+    # hulls on a single line, between the extremes along an edge.
+    top = extreme(-ey, ex)
+    right, left = extreme(ex, ey), extreme(-ex, -ey)
+    pairs = [(candidate, end) for candidate in (step(top, -1), top, step(top, 1))
+             for end in (positions, following)] + [(right, left)]
+    distances = [np.hypot(xs[i] - xs[j], ys[i] - ys[j]) for i, j in pairs]
+    diameters = per_hull(np.maximum, np.max(distances, axis=0))
+
+    # Minimum rectangle: one side lies on an edge; its length is the spread
+    # along the edge and its height the furthest distance from it.
+    edges = lengths > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        widths = ((xs[right] - xs[left]) * ex + (ys[right] - ys[left]) * ey) / lengths
+        heights = (ex * (ys[top] - ys) - ey * (xs[top] - xs)) / lengths
+    rectangles = per_hull(np.minimum, np.where(edges, widths * heights, np.inf), np.inf)
+    # Hulls of a single point have no edge to rest a rectangle on.
+    rectangles[np.isinf(rectangles)] = 0.0
+    return areas, perimeters, diameters, np.maximum(rectangles, 0.0)
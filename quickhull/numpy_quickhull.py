@@ -0,0 +1,239 @@
+import numpy as np
+
+from .predicates import ERROR_BOUND, stats
+from .quickhull import PointArray
+
+
+def _two_sum(a, b):
+    total = a + b
+    b_part = total - a
+    return total, (a - (total - b_part)) + (b - b_part)
+
+
+def _split(a):
+    c = 134217729.0 * a
+    high = c - (c - a)
+    return high, a - high
+
+
+def _two_product(a, b):
+    product = a * b
+    a_high, a_low = _split(a)
+    b_high, b_low = _split(b)
+    return product, a_low * b_low - (((product - a_high * b_high) - a_low * b_high) -
+                                      a_high * b_low)
+
+
+def _exact_orientations(bx, by, ex, ey, xs, ys):
+    # Shewchuk's error-free transformations, vectorized: the differences
+    # and products are split into exact two-term sums, and the sixteen
+    # resulting terms are summed into a nonoverlapping expansion, smallest
+    # component first. Adding that up smallest first keeps its exact sign.
+    ax, ax_tail = _two_sum(bx, -xs)
+    ay, ay_tail = _two_sum(ey, -ys)
+    cx, cx_tail = _two_sum(ex, -xs)
+    cy, cy_tail = _two_sum(by, -ys)
+    terms = []
+    for a, b, sign in ((ax, ay, 1), (ax, ay_tail, 1), (ax_tail, ay, 1), (ax_tail, ay_tail, 1),
+                       (cx, cy, -1), (cx, cy_tail, -1), (cx_tail, cy, -1),
+                       (cx_tail, cy_tail, -1)):
+        product, error = _two_product(a, b)
+        terms += [sign * product, sign * error]
+    expansion = []
+    for term in terms:
+        grown = []
+        for component in expansion:
+            term, error = _two_sum(term, component)
+            grown.append(error)
+        expansion = grown + [term]
+    determinants = expansion[0]
+    for component in expansion[1:]:
+        determinants = determinants + component
+    return determinants
+
+
+def orientations(bx, by, ex, ey, xs, ys):
+    # Vectorized predicates.orientation; any argument may be an array.
+    left = (bx - xs) * (ey - ys)
+    right = (ex - xs) * (by - ys)
+    determinants = left - right
+    if determinants.dtype.kind != 'f':
+        return determinants
+    # Only the entries the floating-point filter cannot certify are
+    # recomputed exactly; integer coordinates never need that.
+    ambiguous = np.flatnonzero(
+        (np.abs(determinants) <= ERROR_BOUND * (np.abs(left) + np.abs(right))) &
+        ((left != 0) | (right != 0)))
+    if len(ambiguous):
+        stats.exact += len(ambiguous)
+        if determinants.ndim == 0:
+            return _exact_orientations(bx, by, ex, ey, xs, ys)
+        arguments = np.broadcast_arrays(bx, by, ex, ey, xs, ys)
+        determinants[ambiguous] = _exact_orientations(
+            *(np.asarray(a, dtype=float)[ambiguous] for a in arguments))
+    return determinants
+
+
+class NumpyQuickHull:
+
+    def __init__(self, points, prefilter=False):
+        if isinstance(points, PointArray):
+            # column_stack already returns a fresh array to permute.
+            self.points = np.column_stack((np.asarray(points.xs), np.asarray(points.ys)))
+        else:
+            self.points = np.array(points)
+        self.hull_size = 0
+        self.prefilter = prefilter
+        self.discarded = 0
+
+    def hull(self):
+        return self.points[:self.hull_size]
+
+    def _swap(self, i, j):
+        if i != j:
+            row = self.points[i].copy()
+            self.points[i] = self.points[j]
+            self.points[j] = row
+
+    def _add_point_to_hull(self, point_index):
+        self._swap(point_index, self.hull_size)
+        self.hull_size += 1
+        return self.hull_size - 1
+
+    def _distances(self, begin, end, line):
+        return orientations(line[0], line[1], line[2], line[3],
+                            self.points[begin:end + 1, 0], self.points[begin:end + 1, 1])
+
+    def _find_lowest_point(self):
+        ys = self.points[:, 1]
+        candidates = np.flatnonzero(ys == ys.min())
+        return int(candidates[np.argmin(self.points[candidates, 0])])
+
+    def _find_furthest_point(self, begin, end, line):
+        distances = -self._distances(begin, end, line)
+        max_distance = distances.max()
+        if max_distance > 0:
+            candidates = np.flatnonzero(distances == max_distance)
+            furthest_point_index = candidates[0]
+            candidates = candidates[1:]
+        else:
+            candidates = np.flatnonzero(distances == 0)
+            furthest_point_index = 0
+        # Ties are resolved exactly like QuickHull._find_furthest_point,
+        # which compares the candidate x against the current best y.
+        xs = self.points[begin:end + 1, 0]
+        ys = self.points[begin:end + 1, 1]
+        for i in candidates:
+            if xs[i] > ys[furthest_point_index]:
+                furthest_point_index = i
+        return begin + int(furthest_point_index)
+
+    def _find_nearest_point(self, point):
+        # QuickHull._find_nearest_point keeps the last point that is not
+        # right of the line from the lowest point to the current best. All
+        # points lie in the half-plane above the lowest one, where that is
+        # an ordering by angle, so the scan ends on the last point of
+        # largest angle. A duplicate of the lowest point is not right of
+        # any line and nothing is right of a line through two copies of
+        # it, so the scan effectively restarts after the last duplicate.
+        ax, ay = self.points[point]
+        xs = self.points[:, 0]
+        ys = self.points[:, 1]
+        duplicates = np.flatnonzero((xs[1:] == ax) & (ys[1:] == ay))
+        start = 2 + int(duplicates[-1]) if len(duplicates) else 1
+        if start >= len(self.points):
+            return len(self.points) - 1
+        xs, ys = xs[start:], ys[start:]
+        # The largest angle is estimated in floating point and then
+        # confirmed with exact predicates; each retry strictly improves it.
+        angles = np.arctan2(ys - ay, xs - ax)
+        best = int(np.argmax(angles))
+        while True:
+            distances = orientations(ax, ay, xs[best], ys[best], xs, ys)
+            better = np.flatnonzero(distances > 0)
+            if not len(better):
+                return start + int(np.flatnonzero(distances == 0)[-1])
+            best = int(better[np.argmax(angles[better])])
+
+    def _discard_interior_points(self):
+        xs = self.points[:, 0]
+        ys = self.points[:, 1]
+        extremes = (np.argmin(ys), np.argmax(xs - ys), np.argmax(xs),
+                    np.argmax(xs + ys), np.argmax(ys), np.argmax(ys - xs),
+                    np.argmin(xs), np.argmin(xs + ys))
+        octagon = []
+        for point in extremes:
+            vertex = tuple(self.points[point])
+            if not octagon or octagon[-1] != vertex:
+                octagon.append(vertex)
+        while len(octagon) > 1 and octagon[0] == octagon[-1]:
+            octagon.pop()
+        if len(octagon) < 3:
+            return
+        scale = np.abs(octagon).max()
+        inside = np.ones(len(xs), dtype=bool)
+        for i in range(len(octagon)):
+            bx, by = octagon[i]
+            ex, ey = octagon[(i + 1) % len(octagon)]
+            a, b = by - ey, ex - bx
+            bound = 8 * np.finfo(float).eps / 2 * \
+                ((abs(a) + abs(b)) * scale + abs(bx * ey) + abs(ex * by))
+            inside &= a * xs + b * ys > ex * by - bx * ey + bound
+        self.discarded = int(np.count_nonzero(inside))
+        self.points = self.points[~inside]
+
+    def _split(self, begin, end, line):
+        if begin > end:
+            return begin
+        is_right = self._distances(begin, end, line) < 0
+        partition = int(np.count_nonzero(is_right))
+        # Pairs up misplaced points the same way the two-pointer loop in
+        # QuickHull._split does, so the resulting order is identical.
+        left = np.flatnonzero(~is_right[:partition]) + begin
+        right = np.flatnonzero(is_right[partition:])[::-1] + begin + partition
+        if len(left):
+            left_points = self.points[left]
+            self.points[left] = self.points[right]
+            self.points[right] = left_points
+        return begin + partition
+
+    def _calculate(self, begin, end, line):
+        stack = [(begin, end, line, None)]
+        while stack:
+            begin, end, line, partition = stack.pop()
+            if partition is not None:
+                self._swap(end, partition)
+                self._add_point_to_hull(partition)
+                fx, fy = self.points[self.hull_size - 1]
+                second_line = (fx, fy, line[2], line[3])
+                second_partition = self._split(partition + 1, end, second_line)
+                stack.append((partition + 1, second_partition - 1, second_line, None))
+                continue
+            if begin > end:
+                continue
+
+            furthest_point_index = self._find_furthest_point(begin, end, line)
+            fx, fy = self.points[furthest_point_index]
+            first_line = (line[0], line[1], fx, fy)
+
+            self._swap(furthest_point_index, end)
+
+            partition = self._split(begin, end - 1, first_line)
+            stack.append((begin, end, line, partition))
+            stack.append((begin, partition - 1, first_line, None))
+
+    def calculate(self):
+        if self.prefilter and len(self.points) > 8:
+            self._discard_interior_points()
+        length = len(self.points)
+        if length < 3:
+            self.hull_size = length
+            return
+        lowest = self._find_lowest_point()
+        lowest = self._add_point_to_hull(lowest)
+        nearest = self._find_nearest_point(lowest)
+        self._swap(nearest, length - 1)
+        lx, ly = self.points[lowest]
+        nx, ny = self.points[length - 1]
+        self._calculate(1, length - 2, (lx, ly, nx, ny))
+        self._add_point_to_hull(length - 1)
@@ -0,0 +1,65 @@
+from bisect import bisect_left
+
+from .predicates import orientation
+from .quickhull import Point, PointArray
+
+
+def _cross(o, a, b):
+    return orientation(o[0], o[1], a[0], a[1], b[0], b[1])
+
+
+class OnlineHull:
+
+    def __init__(self, points=()):
+        # Both chains are sorted by (x, y): the lower one turns strictly
+        # left, the upper one strictly right, and they share their ends.
+        self.lower = []
+        self.upper = []
+        self.size = 0
+        self._first = []
+        self.extend(points)
+
+    @property
+    def hull_size(self):
+        if self.size < 3:
+            return self.size
+        if len(self.lower) < 2:
+            return len(self.lower)
+        return len(self.lower) + len(self.upper) - 2
+
+    def _insert_chain(self, chain, point, sign):
+        i = bisect_left(chain, point)
+        if i < len(chain) and chain[i] == point:
+            return False
+        if 0 < i < len(chain) and sign * _cross(chain[i - 1], chain[i], point) >= 0:
+            return False
+        chain.insert(i, point)
+        while i >= 2 and sign * _cross(chain[i - 2], chain[i - 1], point) <= 0:
+            del chain[i - 1]
+            i -= 1
+        while i + 2 < len(chain) and sign * _cross(point, chain[i + 1], chain[i + 2]) <= 0:
+            del chain[i + 1]
+        return True
+
+    def insert(self, point):
+        point = (point.x, point.y)
+        self.size += 1
+        if self.size < 3:
+            self._first.append(point)
+        inserted = self._insert_chain(self.lower, point, 1)
+        return self._insert_chain(self.upper, point, -1) or inserted
+
+    def extend(self, points):
+        if isinstance(points, PointArray):
+            points = map(Point, points.xs, points.ys)
+        for point in points:
+            self.insert(point)
+
+    def hull(self):
+        if self.size < 3:
+            # Like QuickHull, fewer than three points are returned as given.
+            return [Point(x, y) for x, y in self._first]
+        vertices = self.lower + self.upper[-2:0:-1]
+        # QuickHull order: counter-clockwise, starting at the lowest point.
+        lowest = min(range(len(vertices)), key=lambda i: (vertices[i][1], vertices[i][0]))
+        return [Point(x, y) for x, y in vertices[lowest:] + vertices[:lowest]]
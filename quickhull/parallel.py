@@ -0,0 +1,258 @@
+import os
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+from .predicates import orientation
+from .quickhull import QuickHull, PointArray
+
+
+_worker_hull = None
+
+
+def _share(values, typecode, length):
+    memory = shared_memory.SharedMemory(create=True, size=max(1, 8 * length))
+    view = memory.buf.cast(typecode)[:length]
+    view[:] = values if isinstance(values, array) and values.typecode == typecode \
+        else array(typecode, values)
+    return memory, view
+
+
+def _attach(names, typecodes, lengths):
+    global _worker_hull
+    memories = [shared_memory.SharedMemory(name=name) for name in names]
+    xs, ys, indices = [memory.buf.cast(typecode)[:length]
+                       for memory, typecode, length in zip(memories, typecodes, lengths)]
+    _worker_hull = QuickHull(PointArray(xs, ys), indices=indices)
+    _worker_hull.memories = memories
+
+
+def _split_range(begin, end, line):
+    hull = _worker_hull
+    furthest_point_index = hull._find_furthest_point(begin, end, line)
+    furthest = hull.indices[furthest_point_index]
+    hull._swap(furthest_point_index, end)
+    partition = hull._split(begin, end - 1, (line[0], furthest))
+    # The furthest point may move to its final slot before the left range
+    # is solved, the right range ends up in the same order either way.
+    hull._swap(end, partition)
+    second_partition = hull._split(partition + 1, end, (furthest, line[1]))
+    return partition, furthest, second_partition
+
+
+def _solve_range(begin, end, line):
+    indices = _worker_hull.indices
+    hull = QuickHull(_worker_hull.points, indices=array('q', indices[begin:end + 1]))
+    for _ in hull._calculate(0, end - begin, line):
+        pass
+    indices[begin:end + 1] = memoryview(hull.indices)
+    return hull.hull_size
+
+
+# The scans over all points, split into consecutive chunks. Each worker
+# returns its chunk's own answer; the parent combines them in chunk order.
+
+def _lowest_range(begin, end):
+    hull = QuickHull(_worker_hull.points, indices=_worker_hull.indices[begin:end + 1])
+    return begin + hull._find_lowest_point()
+
+
+def _nearest_range(begin, end, point):
+    return _worker_hull._scan_nearest(point, begin, end)
+
+
+def _furthest_range(begin, end, line):
+    return _worker_hull._find_furthest_point(begin, end, line)
+
+
+def _partition_range(begin, end, first_line, second_line):
+    # Points outside the first line, then those outside the second one,
+    # then the rest, like the two splits of _split_range.
+    hull = _worker_hull
+    middle = hull._split(begin, end, first_line)
+    return middle, hull._split(middle, end, second_line)
+
+
+class ParallelQuickHull(QuickHull):
+    # The pool and the shared buffers live for one run. The scans over all
+    # points (lowest, nearest, and the furthest point and partitions of
+    # every range too big to leave to a single worker) run chunk-wise
+    # across the pool; smaller ranges are split or solved whole.
+
+    def __init__(self, points, processes=None, threshold=100000, prefilter=False):
+        QuickHull.__init__(self, points, prefilter=prefilter)
+        self.processes = processes or os.cpu_count()
+        self.threshold = threshold
+        self._pool = None
+
+    def _open(self):
+        lengths = (len(self.points), len(self.points), len(self.indices))
+        # Integer columns (arrays, or views of a loaded file) are shared as
+        # they are, keeping the exact integer path of the predicates.
+        xs = self.points.xs
+        typecode = 'q' if getattr(xs, 'typecode', getattr(xs, 'format', None)) == 'q' else 'd'
+        typecodes = typecode + typecode + 'q'
+        self._memories, self._views = zip(*map(
+            _share, (self.points.xs, self.points.ys, self.indices), typecodes, lengths))
+        self._pool = ProcessPoolExecutor(self.processes, initializer=_attach,
+                                         initargs=([memory.name for memory in self._memories],
+                                                   typecodes, lengths))
+
+    def _close(self):
+        if self._pool is None:
+            return
+        self._pool.shutdown()
+        self._pool = None
+        for view in self._views:
+            view.release()
+        for memory in self._memories:
+            memory.close()
+            memory.unlink()
+
+    def _stream(self):
+        try:
+            yield from QuickHull._stream(self)
+        finally:
+            self._close()
+
+    def _chunks(self, begin, end):
+        size = -(-(end - begin + 1) // self.processes)
+        return [(first, min(first + size - 1, end)) for first in range(begin, end + 1, size)]
+
+    def _map(self, function, begin, end, *arguments):
+        chunks = self._chunks(begin, end)
+        futures = [self._pool.submit(function, *(chunk + arguments)) for chunk in chunks]
+        return chunks, [future.result() for future in futures]
+
+    def _find_lowest_point(self):
+        if len(self.indices) < self.threshold:
+            return QuickHull._find_lowest_point(self)
+        # The first scan of a run, after any prefiltering: the pool starts
+        # here and is shut down when the run ends.
+        self._open()
+        _, lowest = self._map(_lowest_range, 0, len(self.indices) - 1)
+        # The first lowest point of the chunks' first lowest points.
+        candidates = QuickHull(self.points, indices=array('q', [self.indices[i] for i in lowest]))
+        return lowest[candidates._find_lowest_point()]
+
+    def _find_nearest_point(self, point):
+        if self._pool is None:
+            return QuickHull._find_nearest_point(self, point)
+        self._views[2][:] = self.indices
+        _, results = self._map(_nearest_range, 1, len(self.indices) - 1, point)
+        # A chunk that met a duplicate of the lowest point stands on its
+        # own, any other one wins on a larger or equal angle.
+        xs, ys, indices = self.points.xs, self.points.ys, self.indices
+        ax, ay = xs[indices[point]], ys[indices[point]]
+        nearest = results[0][0]
+        for candidate, restarted in results[1:]:
+            b, c = indices[nearest], indices[candidate]
+            if restarted or not orientation(ax, ay, xs[b], ys[b], xs[c], ys[c]) < 0:
+                nearest = candidate
+        return nearest
+
+    def _split_across(self, begin, end, line):
+        # _split_range for a range too big to leave to one worker.
+        view = self._views[2]
+        _, furthest = self._map(_furthest_range, begin, end, line)
+        candidates = QuickHull(self.points, indices=array('q', [view[i] for i in furthest]))
+        furthest_point_index = furthest[candidates._find_furthest_point(0, len(furthest) - 1, line)]
+        furthest = view[furthest_point_index]
+        view[furthest_point_index], view[end] = view[end], furthest
+        chunks, splits = self._map(_partition_range, begin, end - 1,
+                                   (line[0], furthest), (furthest, line[1]))
+        # Gather the three groups of every chunk, in chunk order, with the
+        # furthest point between the first two.
+        groups = [array('q'), array('q'), array('q')]
+        for (first, last), (middle, rest) in zip(chunks, splits):
+            groups[0].frombytes(view[first:middle].cast('B'))
+            groups[1].frombytes(view[middle:rest].cast('B'))
+            groups[2].frombytes(view[rest:last + 1].cast('B'))
+        view[begin:end + 1] = groups[0] + array('q', [furthest]) + groups[1] + groups[2]
+        self._copy(view, begin, end)
+        partition = begin + len(groups[0])
+        return partition, furthest, partition + 1 + len(groups[1])
+
+    def _submit(self, pool, node):
+        begin, end, line = node[:3]
+        if end - begin + 1 < self.threshold:
+            return pool.submit(_solve_range, begin, end, line)
+        return pool.submit(_split_range, begin, end, line)
+
+    def _copy(self, view, begin, end):
+        if begin <= end:
+            self.indices[begin:end + 1] = array('q', view[begin:end + 1])
+
+    def _walk(self, stack):
+        # Solved ranges hold their hull chain at the front, split points sit
+        # at the partition position; walking the tree in order yields hull
+        # positions in increasing order. The walk stops at the first node
+        # that is still being worked on.
+        while stack:
+            node = stack.pop()
+            if isinstance(node, int):
+                yield self._add_point_to_hull(node)
+            elif node[3] is None:
+                stack.append(node)
+                return
+            elif isinstance(node[3], int):
+                for position in range(node[0], node[0] + node[3]):
+                    yield self._add_point_to_hull(position)
+            else:
+                left, partition, right = node[3]
+                stack.extend((right, partition, left))
+
+    def _schedule(self, nodes, pending):
+        # Ranges holding more than a worker's share of the points are split
+        # across the pool right away; only the root and its first few
+        # descendants are that big, so the workers have nothing else to do
+        # meanwhile. Every other range goes to a single worker.
+        share = max(len(self.indices) // self.processes, self.threshold)
+        nodes = list(nodes)
+        while nodes:
+            node = nodes.pop()
+            begin, end, line = node[:3]
+            if begin > end:
+                node[3] = 0
+            elif self.processes > 1 and end - begin + 1 > share:
+                partition, furthest, second_partition = self._split_across(begin, end, line)
+                nodes += self._expand(node, partition, furthest, second_partition)
+            else:
+                pending[self._submit(self._pool, node)] = node
+
+    def _expand(self, node, partition, furthest, second_partition):
+        children = ([node[0], partition - 1, (node[2][0], furthest), None],
+                    [partition + 1, second_partition - 1, (furthest, node[2][1]), None])
+        node[3] = (children[0], partition, children[1])
+        return children
+
+    def _calculate(self, begin, end, line):
+        if self._pool is None:
+            yield from QuickHull._calculate(self, begin, end, line)
+            return
+        view = self._views[2]
+        view[:] = self.indices
+        root = [begin, end, line, None]
+        stack = [root]
+        pending = {}
+        self._schedule([root], pending)
+        # Hull points are handed out as soon as everything before them is
+        # solved, not when the whole tree is.
+        yield from self._walk(stack)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = pending.pop(future)
+                result = future.result()
+                if isinstance(result, int):
+                    self._copy(view, node[0], node[1])
+                    node[3] = result
+                    continue
+                partition, furthest, second_partition = result
+                # The split point and the points left inside the
+                # triangle are in their final slots already.
+                self._copy(view, partition, partition)
+                self._copy(view, second_partition, node[1])
+                self._schedule(self._expand(node, partition, furthest, second_partition),
+                               pending)
+            yield from self._walk(stack)
@@ -0,0 +1,127 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .quickhull import PointArray, _columns
+
+MAGIC = b'QHPT'
+VERSION = 1
+EXTENSION = '.qhp'
+
+# Magic, version, typecode ('d' or 'q'), padding, point count. The x
+# column follows the 16-byte header, the y column follows the x column.
+# Everything is little-endian; big-endian hosts swap on the way in and out.
+_HEADER = struct.Struct('<4sBcxxQ')
+_SWAP = sys.byteorder == 'big'
+
+
+def _as_array(values, typecode):
+    if isinstance(values, array) and values.typecode == typecode and not _SWAP:
+        return values
+    if typecode == 'q':
+        values = array(typecode, map(int, values))
+    else:
+        values = array(typecode, values)
+    if _SWAP:
+        values.byteswap()
+    return values
+
+
+def _swapped(values):
+    # A little-endian column as a native array, copied.
+    values = array(values.format, values)
+    values.byteswap()
+    return values
+
+
+def write_points(path, points, typecode='d'):
+    if not isinstance(points, PointArray):
+        points = PointArray.from_points(points)
+    with open(path, 'wb') as output:
+        output.write(_HEADER.pack(MAGIC, VERSION, typecode.encode(), len(points)))
+        for values in (points.xs, points.ys):
+            output.write(_as_array(values, typecode))
+
+
+def read_header(path):
+    with open(path, 'rb') as input:
+        return _unpack_header(input.read(_HEADER.size), path)
+
+
+def _unpack_header(data, path):
+    if len(data) < _HEADER.size:
+        raise ValueError('%s: truncated point file header' % path)
+    magic, version, typecode, length = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('%s: not a version %d point file' % (path, VERSION))
+    return typecode.decode(), length
+
+
+def load_points(path):
+    # The columns are memoryviews over a read-only mapping of the file, so
+    # nothing is parsed or copied until the hull engine touches the data.
+    with open(path, 'rb') as input:
+        data = mmap.mmap(input.fileno(), 0, access=mmap.ACCESS_READ)
+    typecode, length = _unpack_header(data, path)
+    size = array(typecode).itemsize * length
+    if len(data) < _HEADER.size + 2 * size:
+        raise ValueError('%s: truncated point data' % path)
+    view = memoryview(data)
+    xs = view[_HEADER.size:_HEADER.size + size].cast(typecode)
+    ys = view[_HEADER.size + size:_HEADER.size + 2 * size].cast(typecode)
+    if _SWAP:
+        return PointArray(_swapped(xs), _swapped(ys))
+    return PointArray(xs, ys)
+
+
+def read_chunks(path, chunk_size):
+    with open(path, 'rb') as input:
+        typecode, length = _unpack_header(input.read(_HEADER.size), path)
+        itemsize = array(typecode).itemsize
+        for begin in range(0, length, chunk_size):
+            count = min(chunk_size, length - begin)
+            columns = []
+            for column in range(2):
+                input.seek(_HEADER.size + (column * length + begin) * itemsize)
+                values = array(typecode)
+                values.fromfile(input, count)
+                if _SWAP:
+                    values.byteswap()
+                columns.append(values)
+            yield PointArray(*columns)
+
+
+def read_text(path):
+    with open(path, 'r') as input:
+        values = input.read().split()
+    length = int(values[0])
+    values = values[1:]
+    if len(values) < 2 * length:
+        # Files written by the old generator hold one value per line;
+        # consecutive values are paired up into points.
+        length = len(values) // 2
+    try:
+        values = [int(value) for value in values[:2 * length]]
+    except ValueError:
+        values = [float(value) for value in values[:2 * length]]
+    return PointArray(*_columns(values[0::2], values[1::2]))
+
+
+def convert_text(source, destination, typecode='d'):
+    write_points(destination, read_text(source), typecode)
+
+
+def convert_tree(source, destination, typecode='d'):
+    for directory, _, names in os.walk(source):
+        target = os.path.join(destination, os.path.relpath(directory, source))
+        for name in names:
+            if name.endswith('.txt'):
+                os.makedirs(target, exist_ok=True)
+                convert_text(os.path.join(directory, name),
+                             os.path.join(target, name[:-4] + EXTENSION), typecode)
+
+
+if __name__ == '__main__':
+    convert_tree(*sys.argv[1:])
@@ -0,0 +1,57 @@
+import math
+
+# Shewchuk's error bound for the floating-point orientation determinant:
+# whenever the computed value exceeds it in magnitude its sign is exact.
+ERROR_BOUND = (3.0 + 16.0 * 2.0 ** -53) * 2.0 ** -53
+
+
+class PredicateStats:
+
+    def __init__(self):
+        self.exact = 0
+
+    def reset(self):
+        self.exact = 0
+
+
+stats = PredicateStats()
+
+
+def exact_orientation(bx, by, ex, ey, x, y):
+    # Every float is an integer over a power of two, so over a common
+    # denominator the determinant is computed exactly in integers. The
+    # result is the exact value correctly rounded, so its sign is exact.
+    stats.exact += 1
+    bx, bx_denominator = bx.as_integer_ratio()
+    by, by_denominator = by.as_integer_ratio()
+    ex, ex_denominator = ex.as_integer_ratio()
+    ey, ey_denominator = ey.as_integer_ratio()
+    x, x_denominator = x.as_integer_ratio()
+    y, y_denominator = y.as_integer_ratio()
+    denominator = max(bx_denominator, by_denominator, ex_denominator,
+                      ey_denominator, x_denominator, y_denominator)
+    bx *= denominator // bx_denominator
+    by *= denominator // by_denominator
+    ex *= denominator // ex_denominator
+    ey *= denominator // ey_denominator
+    x *= denominator // x_denominator
+    y *= denominator // y_denominator
+    determinant = (bx - x) * (ey - y) - (ex - x) * (by - y)
+    value = determinant / (denominator * denominator)
+    if determinant and not value:
+        # Too small for a float; keep the sign.
+        return math.copysign(5e-324, determinant)
+    return value
+
+
+def orientation(bx, by, ex, ey, x, y):
+    # Positive when (x, y) is left of the line from b to e, negative when it
+    # is right of it and zero when the three points are collinear. Integer
+    # coordinates are always exact and never take the fallback.
+    left = (bx - x) * (ey - y)
+    right = (ex - x) * (by - y)
+    determinant = left - right
+    if abs(determinant) <= ERROR_BOUND * (abs(left) + abs(right)) and (left or right) and \
+            type(determinant) is not int:
+        return exact_orientation(bx, by, ex, ey, x, y)
+    return determinant
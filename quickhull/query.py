@@ -0,0 +1,157 @@
+import math
+from array import array
+from bisect import bisect_left
+
+from .predicates import orientation
+from .quickhull import PointArray
+
+
+class HullIndex:
+    # Answers queries against a computed hull in O(log h). Vertices are
+    # expected in QuickHull order: counter-clockwise from the lowest point,
+    # with no collinear vertices. Any engine's hull() will do, including the
+    # (h, 2) array NumpyQuickHull returns.
+
+    def __init__(self, vertices):
+        if not isinstance(vertices, PointArray):
+            vertices = PointArray.from_points(vertices)
+        self.points = vertices
+        xs, ys = vertices.xs, vertices.ys
+        size = len(vertices)
+        # Edge i runs from vertex i to vertex i + 1. Starting at the lowest
+        # point, the edge angles increase monotonically over [0, 2 pi).
+        self.angles = array('d', [
+            math.atan2(ys[(i + 1) % size] - ys[i], xs[(i + 1) % size] - xs[i]) % (2 * math.pi)
+            for i in range(size)])
+        # The vertex average is strictly inside a hull with three vertices.
+        self.centre = (sum(xs) / size, sum(ys) / size) if size else None
+
+    @staticmethod
+    def from_hull(hull):
+        return HullIndex(hull.hull())
+
+    def __len__(self):
+        return len(self.points)
+
+    def _orientation(self, begin, end, x, y):
+        xs, ys = self.points.xs, self.points.ys
+        return orientation(xs[begin], ys[begin], xs[end], ys[end], x, y)
+
+    def _wedge(self, x, y):
+        # The largest i with (x, y) on or left of the ray from vertex 0
+        # through vertex i, for points inside the angle at vertex 0.
+        low, high = 1, len(self.points) - 1
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self._orientation(0, middle, x, y) >= 0:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def _contains_degenerate(self, x, y):
+        xs, ys = self.points.xs, self.points.ys
+        if len(self.points) == 1:
+            return (x, y) == (xs[0], ys[0])
+        return len(self.points) == 2 and self._orientation(0, 1, x, y) == 0 and \
+            min(xs[0], xs[1]) <= x <= max(xs[0], xs[1]) and \
+            min(ys[0], ys[1]) <= y <= max(ys[0], ys[1])
+
+    def contains(self, point):
+        # Points on the boundary count as contained.
+        x, y = point.x, point.y
+        size = len(self.points)
+        if size < 3:
+            return self._contains_degenerate(x, y)
+        if self._orientation(0, 1, x, y) < 0 or self._orientation(0, size - 1, x, y) > 0:
+            return False
+        wedge = self._wedge(x, y)
+        return self._orientation(wedge, wedge + 1, x, y) >= 0
+
+    def _dot(self, i, dx, dy):
+        return self.points.xs[i] * dx + self.points.ys[i] * dy
+
+    def extreme(self, dx, dy):
+        # Index of the vertex furthest in direction (dx, dy). The vertex
+        # where the edge angle passes the direction turned by 90 degrees is
+        # found by bisection, then confirmed against its neighbours.
+        size = len(self.points)
+        if size == 0:
+            raise ValueError('empty hull has no extreme vertex')
+        target = (math.atan2(dy, dx) + math.pi / 2) % (2 * math.pi)
+        i = bisect_left(self.angles, target) % size
+        for step in (1, -1):
+            while size > 1 and self._dot((i + step) % size, dx, dy) > self._dot(i, dx, dy):
+                i = (i + step) % size
+        return i
+
+    def _visible(self, edge, x, y):
+        size = len(self.points)
+        return self._orientation(edge % size, (edge + 1) % size, x, y) < 0
+
+    def _transition(self, begin, end, x, y, visible):
+        # Edges begin..end (cyclic) start with a run where _visible equals
+        # `visible` and finish with one where it does not. Returns the last
+        # edge of the first run.
+        low, high = begin, end
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self._visible(middle, x, y) == visible:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def tangents(self, point):
+        # Indices (first, last) of the two tangent vertices of an outside
+        # point: the counter-clockwise chain from first to last faces it.
+        x, y = point.x, point.y
+        size = len(self.points)
+        if size < 3:
+            raise ValueError('tangents need a hull with at least three vertices')
+        if self._orientation(0, 1, x, y) < 0:
+            visible = 0
+        elif self._orientation(0, size - 1, x, y) > 0:
+            visible = size - 1
+        else:
+            visible = self._wedge(x, y)
+            if not self._visible(visible, x, y):
+                raise ValueError('point is not outside the hull')
+        # Of the two edges at the vertex furthest away from the point, seen
+        # from the centre, at least one cannot be visible.
+        cx, cy = self.centre
+        back = self.extreme(cx - x, cy - y)
+        hidden = back if not self._visible(back, x, y) else back - 1
+        hidden = (hidden - visible) % size + visible
+        last = self._transition(visible, hidden, x, y, True)
+        first = self._transition(hidden, visible + size, x, y, False)
+        return (first + 1) % size, (last + 1) % size
+
+    def contains_all(self, xs, ys, chunk_size=1 << 20):
+        # Vectorized contains() over whole coordinate arrays; returns a
+        # boolean array. Every chunk runs the same bisection in lockstep.
+        import numpy as np
+        from .numpy_quickhull import orientations
+
+        xs, ys = np.asarray(xs), np.asarray(ys)
+        result = np.zeros(len(xs), dtype=bool)
+        size = len(self.points)
+        if size < 3:
+            for i in range(len(xs)):
+                result[i] = self._contains_degenerate(xs[i], ys[i])
+            return result
+        hx, hy = np.asarray(self.points.xs), np.asarray(self.points.ys)
+        for begin in range(0, len(xs), chunk_size):
+            x, y = xs[begin:begin + chunk_size], ys[begin:begin + chunk_size]
+            inside = (orientations(hx[0], hy[0], hx[1], hy[1], x, y) >= 0) & \
+                (orientations(hx[0], hy[0], hx[-1], hy[-1], x, y) <= 0)
+            low = np.ones(len(x), dtype=np.intp)
+            high = np.full(len(x), size - 1, dtype=np.intp)
+            for _ in range(max(size - 2, 1).bit_length()):
+                middle = (low + high) // 2
+                left = orientations(hx[0], hy[0], hx[middle], hy[middle], x, y) >= 0
+                low = np.where(left, middle, low)
+                high = np.where(left, high, middle)
+            inside &= orientations(hx[low], hy[low], hx[low + 1], hy[low + 1], x, y) >= 0
+            result[begin:begin + len(x)] = inside
+        return result
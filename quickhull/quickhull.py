@@ -1,11 +1,18 @@
+from array import array
+
+from .predicates import ERROR_BOUND, exact_orientation, orientation
+
+
 class Point:
+    __slots__ = ('x', 'y')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
 
     def distance_to_line(self, line):
-        return (line.begin.x - self.x) * (line.end.y - self.y) - \
-               (line.end.x - self.x) * (line.begin.y - self.y)
+        return orientation(line.begin.x, line.begin.y,
+                           line.end.x, line.end.y, self.x, self.y)
 
     def is_right(self, line):
         return self.distance_to_line(line) < 0
@@ -15,137 +22,325 @@ class Point:
 
     @staticmethod
     def is_clockwise_order(a, b, c):
-        return a.x * (b.y - c.y) + \
-            b.x * (c.y - a.y) + \
-            c.x * (a.y - b.y) < 0
+        return orientation(a.x, a.y, b.x, b.y, c.x, c.y) < 0
 
 
 class Line:
+    __slots__ = ('begin', 'end')
+
     def __init__(self, begin, end):
         self.begin = begin
         self.end = end
 
 
+def _columns(*values):
+    # Integer coordinates stay 'q' columns, so the predicates keep their
+    # exact integer path; anything else, or integers beyond 64 bits, is 'd'.
+    if all(type(value) is int for column in values for value in column):
+        try:
+            return [array('q', column) for column in values]
+        except OverflowError:
+            pass
+    return [array('d', column) for column in values]
+
+
+class PointArray:
+    __slots__ = ('xs', 'ys')
+
+    def __init__(self, xs=None, ys=None):
+        self.xs = array('d') if xs is None else xs
+        self.ys = array('d') if ys is None else ys
+
+    @staticmethod
+    def from_points(points):
+        if getattr(points, 'ndim', None) == 2:
+            # An (N, 2) NumPy array, such as NumpyQuickHull.hull().
+            return PointArray(array('d', points[:, 0].astype(float).tobytes()),
+                              array('d', points[:, 1].astype(float).tobytes()))
+        return PointArray(*_columns([point.x for point in points],
+                                    [point.y for point in points]))
+
+    def append(self, x, y):
+        self.xs.append(x)
+        self.ys.append(y)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Point(x, y) for x, y in zip(self.xs[index], self.ys[index])]
+        return Point(self.xs[index], self.ys[index])
+
+
+_SPLIT, _MERGE = range(2)
+
+_EPSILON = 2.0 ** -53
+
+
 class QuickHull:
 
-    def __init__(self, points, handler=None):
+    def __init__(self, points, *, indices=None, prefilter=False):
+        if not isinstance(points, PointArray):
+            points = PointArray.from_points(points)
         self.points = points
+        if indices is None:
+            indices = array('q', range(len(points)))
+        self.indices = indices
         self.hull_size = 0
-        self.handler = handler
+        self.prefilter = prefilter
+        self.discarded = 0
+        # The indices array the last complete run left the hull in; callers
+        # that swap in a new one (batch_hull does) get a fresh run.
+        self._computed = None
+
+    def hull(self):
+        return [self.points[i] for i in self.indices[:self.hull_size]]
+
+    def vertices(self):
+        # Computes the hull lazily: every vertex is yielded as soon as it is
+        # committed, in the same counter-clockwise order as hull().
+        for position in self._stream():
+            yield self.points[self.indices[position]]
+
+    def edges(self):
+        # Like vertices(), as (begin, end) pairs; the closing edge back to
+        # the lowest point comes last.
+        first = previous = None
+        for vertex in self.vertices():
+            if previous is None:
+                first = vertex
+            else:
+                yield previous, vertex
+            previous = vertex
+        if self.hull_size > 2:
+            yield previous, first
+
+    def _swap(self, i, j):
+        indices = self.indices
+        indices[i], indices[j] = indices[j], indices[i]
 
     def _add_point_to_hull(self, point_index):
-        self.points[point_index], self.points[self.hull_size] = \
-            self.points[self.hull_size], self.points[point_index]
-        if self.hull_size != 0:
-            self._add_to_hull(self.points[self.hull_size - 1], self.points[self.hull_size])
+        self._swap(point_index, self.hull_size)
         self.hull_size += 1
         return self.hull_size - 1
 
     def _find_lowest_point(self):
+        xs, ys, indices = self.points.xs, self.points.ys, self.indices
         lowest = 0
-        for i in range(1, len(self.points)):
-            distance_x = self.points[i].x - self.points[lowest].x
-            distance_y = self.points[i].y - self.points[lowest].y
+        for i in range(1, len(indices)):
+            distance_x = xs[indices[i]] - xs[indices[lowest]]
+            distance_y = ys[indices[i]] - ys[indices[lowest]]
             if distance_y < 0 or distance_y == 0 and distance_x < 0:
                 lowest = i
         return lowest
 
     def _find_furthest_point(self, begin, end, line):
+        xs, ys, indices = self.points.xs, self.points.ys, self.indices
+        bx, by = xs[line[0]], ys[line[0]]
+        ex, ey = xs[line[1]], ys[line[1]]
         furthest_point_index = begin
+        furthest_y = ys[indices[begin]]
         max_distance = 0
         for i in range(begin, end + 1):
-            current_distance = -self.points[i].distance_to_line(line)
+            point = indices[i]
+            x, y = xs[point], ys[point]
+            left = (bx - x) * (ey - y)
+            right = (ex - x) * (by - y)
+            current_distance = right - left
+            if abs(current_distance) <= ERROR_BOUND * (abs(left) + abs(right)) and (left or right) and \
+                    type(current_distance) is not int:
+                current_distance = -exact_orientation(bx, by, ex, ey, x, y)
             if current_distance > max_distance or \
-                    current_distance == max_distance and \
-                    self.points[i].x > self.points[furthest_point_index].y:
+                    current_distance == max_distance and x > furthest_y:
                 furthest_point_index = i
+                furthest_y = y
                 max_distance = current_distance
         return furthest_point_index
 
     def _find_nearest_point(self, point):
-        nearest_point_index = 1
-        for i in range(2, len(self.points)):
-            if not Point.is_clockwise_order(self.points[point],
-                                            self.points[nearest_point_index],
-                                            self.points[i]):
+        return self._scan_nearest(point, 1, len(self.indices) - 1)[0]
+
+    def _scan_nearest(self, point, begin, end):
+        # The last of positions begin..end with the largest angle seen from
+        # the lowest point; a duplicate of it starts the scan afresh. Also
+        # tells whether that happened, so scans of consecutive ranges can
+        # be combined.
+        xs, ys, indices = self.points.xs, self.points.ys, self.indices
+        ax, ay = xs[indices[point]], ys[indices[point]]
+        nearest_point_index = begin
+        bx, by = xs[indices[begin]], ys[indices[begin]]
+        restarted = bx == ax and by == ay
+        for i in range(begin + 1, end + 1):
+            cx, cy = xs[indices[i]], ys[indices[i]]
+            left = (ax - cx) * (by - cy)
+            right = (bx - cx) * (ay - cy)
+            distance = left - right
+            if abs(distance) <= ERROR_BOUND * (abs(left) + abs(right)) and (left or right) and \
+                    type(distance) is not int:
+                distance = exact_orientation(ax, ay, bx, by, cx, cy)
+            if not distance < 0:
                 nearest_point_index = i
-        return nearest_point_index
+                bx, by = cx, cy
+                if cx == ax and cy == ay:
+                    restarted = True
+        return nearest_point_index, restarted
 
     def _split(self, begin, end, line):
+        xs, ys, indices = self.points.xs, self.points.ys, self.indices
+        bx, by = xs[line[0]], ys[line[0]]
+        ex, ey = xs[line[1]], ys[line[1]]
         while begin <= end:
-            while begin <= end and self.points[begin].is_right(line):
+            while begin <= end:
+                point = indices[begin]
+                x, y = xs[point], ys[point]
+                left = (bx - x) * (ey - y)
+                right = (ex - x) * (by - y)
+                distance = left - right
+                if abs(distance) <= ERROR_BOUND * (abs(left) + abs(right)) and (left or right) and \
+                        type(distance) is not int:
+                    distance = exact_orientation(bx, by, ex, ey, x, y)
+                if not distance < 0:
+                    break
                 begin += 1
-            while begin <= end and not self.points[end].is_right(line):
+            while begin <= end:
+                point = indices[end]
+                x, y = xs[point], ys[point]
+                left = (bx - x) * (ey - y)
+                right = (ex - x) * (by - y)
+                distance = left - right
+                if abs(distance) <= ERROR_BOUND * (abs(left) + abs(right)) and (left or right) and \
+                        type(distance) is not int:
+                    distance = exact_orientation(bx, by, ex, ey, x, y)
+                if distance < 0:
+                    break
                 end -= 1
             if begin <= end:
-                self.points[begin], self.points[end] = \
-                    self.points[end], self.points[begin]
+                indices[begin], indices[end] = indices[end], indices[begin]
                 begin += 1
                 end -= 1
         return begin
 
-    def _add_to_hull(self, begin, end):
-        if self.handler:
-            self.handler.add_to_hull(begin, end)
-
-    def _add_line(self, start, finish, comment):
-        if self.handler:
-            self.handler.add_line(start, finish, comment)
-
-    def _remove_line(self, start, finish, comment):
-        if self.handler:
-            self.handler.remove_line(start, finish, comment)
-
-    def _select_points(self, begin, end, comment):
-        if self.handler:
-            self.handler.select_points(self.points[begin:end+1], comment)
-
-    def _deselect_points(self):
-        if self.handler:
-            self.handler.deselect_points()
+    def _find_extreme_points(self):
+        xs, ys = self.points.xs, self.points.ys
+        first = self.indices[0]
+        extremes = [first] * 8
+        x, y = xs[first], ys[first]
+        bottom, bottom_right, right, top_right = y, x - y, x, x + y
+        top, top_left, left, bottom_left = y, y - x, x, x + y
+        for point in self.indices:
+            x, y = xs[point], ys[point]
+            if y < bottom:
+                bottom, extremes[0] = y, point
+            if x - y > bottom_right:
+                bottom_right, extremes[1] = x - y, point
+            if x > right:
+                right, extremes[2] = x, point
+            if x + y > top_right:
+                top_right, extremes[3] = x + y, point
+            if y > top:
+                top, extremes[4] = y, point
+            if y - x > top_left:
+                top_left, extremes[5] = y - x, point
+            if x < left:
+                left, extremes[6] = x, point
+            if x + y < bottom_left:
+                bottom_left, extremes[7] = x + y, point
+        return extremes
+
+    def _discard_interior_points(self):
+        # Akl-Toussaint heuristic: the extreme points in the axis and
+        # diagonal directions form a convex octagon (counter-clockwise from
+        # the bottom), and nothing strictly inside it can be on the hull.
+        xs, ys = self.points.xs, self.points.ys
+        octagon = []
+        for point in self._find_extreme_points():
+            vertex = (xs[point], ys[point])
+            if not octagon or octagon[-1] != vertex:
+                octagon.append(vertex)
+        while len(octagon) > 1 and octagon[0] == octagon[-1]:
+            octagon.pop()
+        if len(octagon) < 3:
+            return
+        scale = max(max(abs(x), abs(y)) for x, y in octagon)
+        edges = []
+        for i in range(8):
+            bx, by = octagon[i % len(octagon)]
+            ex, ey = octagon[(i + 1) % len(octagon)]
+            a, b = by - ey, ex - bx
+            # Rounding slack keeps the test conservative for float input.
+            bound = 8 * _EPSILON * ((abs(a) + abs(b)) * scale + abs(bx * ey) + abs(ex * by))
+            edges += [a, b, ex * by - bx * ey + bound]
+        a0, b0, c0, a1, b1, c1, a2, b2, c2, a3, b3, c3, \
+            a4, b4, c4, a5, b5, c5, a6, b6, c6, a7, b7, c7 = edges
+        kept = array('q')
+        for point in self.indices:
+            x, y = xs[point], ys[point]
+            if a0 * x + b0 * y > c0 and a1 * x + b1 * y > c1 and \
+                    a2 * x + b2 * y > c2 and a3 * x + b3 * y > c3 and \
+                    a4 * x + b4 * y > c4 and a5 * x + b5 * y > c5 and \
+                    a6 * x + b6 * y > c6 and a7 * x + b7 * y > c7:
+                continue
+            kept.append(point)
+        self.discarded = len(self.indices) - len(kept)
+        self.indices = kept
 
     def _calculate(self, begin, end, line):
-        if begin > end:
+        # Pending work is kept on an explicit stack instead of the call
+        # stack, so hulls with many vertices cannot exhaust the recursion
+        # limit. Lines are pairs of point ids, positions index self.indices.
+        # Yields the position of every hull point as it is committed.
+        indices = self.indices
+        stack = [(_SPLIT, begin, end, line, None)]
+        while stack:
+            kind, begin, end, line, furthest = stack.pop()
+            if kind == _SPLIT:
+                if begin > end:
+                    continue
+                furthest_point_index = self._find_furthest_point(begin, end, line)
+                furthest = indices[furthest_point_index]
+                self._swap(furthest_point_index, end)
+
+                first_line = (line[0], furthest)
+                partition = self._split(begin, end - 1, first_line)
+                stack.append((_MERGE, partition, end, line, furthest))
+                stack.append((_SPLIT, begin, partition - 1, first_line, None))
+            else:
+                partition = begin
+                self._swap(end, partition)
+                yield self._add_point_to_hull(partition)
+
+                second_line = (furthest, line[1])
+                second_partition = self._split(partition + 1, end, second_line)
+                stack.append((_SPLIT, partition + 1, second_partition - 1, second_line, None))
+
+    def _stream(self):
+        if self._computed is self.indices:
+            yield from range(self.hull_size)
             return
-        self._select_points(begin, end, "Selecting points range")
-        self._add_line(line.begin, line.end, "Split into two parts (depending on line).")
-        furthest_point_index = self._find_furthest_point(begin, end, line)
-        first_line = Line(line.begin, self.points[furthest_point_index])
-        second_line = Line(self.points[furthest_point_index], line.end)
-        self._add_line(first_line.begin, first_line.end, "Find furthest point and draw new two lines.")
-        self._add_line(second_line.begin, second_line.end, "Find furthest point and draw new two lines.")
-        self._remove_line(line.begin, line.end, "Split into two parts (depending on line).")
-        self._deselect_points()
-
-        self.points[furthest_point_index], self.points[end] = \
-            self.points[end], self.points[furthest_point_index]
-
-        partition = self._split(begin, end - 1, first_line)
-        self._calculate(begin, partition - 1, first_line)
-        self._remove_line(first_line.begin, first_line.end, "")
-
-        self.points[end], self.points[partition] = \
-            self.points[partition], self.points[end]
-        self._add_point_to_hull(partition)
-
-        second_partition = self._split(partition + 1, end, second_line)
-        self._calculate(partition + 1, second_partition - 1, second_line)
-        self._remove_line(second_line.begin, second_line.end, "")
-
-    def calculate(self):
-        length = len(self.points)
+        self._computed = None
+        self.hull_size = 0
+        if self.prefilter and len(self.indices) > 8:
+            self._discard_interior_points()
+        length = len(self.indices)
         if length < 3:
             self.hull_size = length
+            self._computed = self.indices
+            yield from range(length)
             return
         lowest = self._find_lowest_point()
         lowest = self._add_point_to_hull(lowest)
+        yield lowest
         nearest = self._find_nearest_point(lowest)
-        self._add_to_hull(self.points[lowest], self.points[nearest])
-        self.points[nearest], self.points[length - 1] = \
-            self.points[length - 1], self.points[nearest]
-        self._calculate(1, length - 2, Line(
-            self.points[lowest], self.points[length - 1]))
-        self._add_point_to_hull(length - 1)
+        self._swap(nearest, length - 1)
+        yield from self._calculate(1, length - 2, (self.indices[lowest], self.indices[length - 1]))
+        position = self._add_point_to_hull(length - 1)
+        self._computed = self.indices
+        yield position
+
+    def calculate(self):
+        for _ in self._stream():
+            pass
 
 
 def _test():
@@ -153,21 +348,20 @@ def _test():
     output = open('output.txt', 'w')
 
     n = int(input.readline())
-    points = []
+    points = PointArray(array('q'), array('q'))
     for i in range(n):
         x, y = map(int, input.readline().split())
-        points.append(Point(x, y))
+        points.append(x, y)
 
     q = QuickHull(points)
     q.calculate()
 
     output.writelines(str(q.hull_size) + '\n')
-    for i in range(q.hull_size):
-        output.writelines(str(int(q.points[i].x)) + ' ' +
-                          str(int(q.points[i].y)) + '\n')
+    for point in q.hull():
+        output.writelines(str(int(point.x)) + ' ' +
+                          str(int(point.y)) + '\n')
 
     input.close()
     output.close()
 
 # _test()
-
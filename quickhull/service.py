@@ -0,0 +1,334 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import struct
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .batch import batch_hull
+from .numpy_quickhull import NumpyQuickHull
+from .quickhull import PointArray
+
+# Request: id, kind, point count, then the x and the y column as doubles.
+# Response: id, status, item count, then the hull ids ('q') for a hull
+# request, or count bytes of JSON (metrics) or UTF-8 (errors).
+_HEADER = struct.Struct('<QBxxxI')
+HULL, METRICS = range(2)
+OK, ERROR = range(2)
+
+# Below this many points per request NumPy's per-call overhead outweighs
+# vectorization (NumpyQuickHull takes about 3x as long as QuickHull on 100
+# points and is 4.5x faster on 10000).
+VECTORIZED_SIZE = 1024
+
+
+def _vectorized_hull(xs, ys):
+    # NumpyQuickHull permutes coordinates rather than ids, so the ids of
+    # the hull vertices are looked up again among the points sorted by x,
+    # then y (the order NumPy sorts complex numbers in).
+    hull = NumpyQuickHull(np.column_stack((xs, ys)))
+    hull.calculate()
+    keys = xs + 1j * ys
+    order = np.argsort(keys, kind='stable')
+    vertices = hull.hull()
+    positions = np.searchsorted(keys[order], vertices[:, 0] + 1j * vertices[:, 1])
+    return order[positions].astype(np.int64).tobytes()
+
+
+def _hull_batch(xs, ys, offsets):
+    # Runs in a worker. Requests above VECTORIZED_SIZE points go through the
+    # NumPy kernel one by one; the others share one batch_hull call, then
+    # their ids are rebased to each request's own points.
+    xs, ys = np.frombuffer(xs), np.frombuffer(ys)
+    results = [None] * (len(offsets) - 1)
+    small = [request for request in range(len(results))
+             if offsets[request + 1] - offsets[request] <= VECTORIZED_SIZE]
+    for request in set(range(len(results))).difference(small):
+        begin, end = offsets[request], offsets[request + 1]
+        results[request] = _vectorized_hull(xs[begin:end], ys[begin:end])
+    if small:
+        small_offsets = array('q', itertools.accumulate(
+            [0] + [offsets[request + 1] - offsets[request] for request in small]))
+        small_xs = np.concatenate([xs[offsets[request]:offsets[request + 1]] for request in small])
+        small_ys = np.concatenate([ys[offsets[request]:offsets[request + 1]] for request in small])
+        hull_offsets, hull_indices = batch_hull(
+            PointArray(array('d', small_xs.tobytes()), array('d', small_ys.tobytes())),
+            small_offsets, processes=1)
+        for request, begin, first, last in zip(small, small_offsets, hull_offsets,
+                                               hull_offsets[1:]):
+            results[request] = array(
+                'q', [index - begin for index in hull_indices[first:last]]).tobytes()
+    return results
+
+
+class ServiceMetrics:
+
+    def __init__(self, samples=10000):
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_points = 0
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.latencies = deque(maxlen=samples)
+
+    def percentile(self, fraction):
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[min(int(fraction * len(latencies)), len(latencies) - 1)]
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'batched_points': self.batched_points,
+            'queue_depth': self.queue_depth,
+            'in_flight_batches': self.in_flight,
+            'latency': {'p50': self.percentile(0.5), 'p90': self.percentile(0.9),
+                        'p99': self.percentile(0.99), 'max': max(self.latencies, default=0.0)},
+        }
+
+
+class HullServer:
+    # Requests from all connections share one queue. The batcher takes
+    # whatever arrives within max_delay of the first request (up to
+    # max_batch requests or max_batch_points points) and runs it in the
+    # worker pool, small requests as one batch_hull call and large ones on
+    # the NumPy kernel; while the workers are busy the queue keeps filling,
+    # so batches grow with load. Larger single requests are refused.
+    max_batch = 256
+    max_batch_points = 1 << 20
+    max_delay = 0.002
+
+    def __init__(self, processes=None, max_batch=None, max_batch_points=None, max_delay=None):
+        self.processes = processes or os.cpu_count()
+        if max_batch is not None:
+            self.max_batch = max_batch
+        if max_batch_points is not None:
+            self.max_batch_points = max_batch_points
+        if max_delay is not None:
+            self.max_delay = max_delay
+        self.metrics = ServiceMetrics()
+        self.queue = None
+        self.pool = None
+        self.server = None
+        self._batcher = None
+        self._connections = {}
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        self.queue = asyncio.Queue()
+        self.pool = ProcessPoolExecutor(self.processes)
+        # Forked workers inherit the sockets open at the time and keep them
+        # alive after the server closes them, so every worker is started
+        # (on the first submit) before listening.
+        await asyncio.get_event_loop().run_in_executor(self.pool, os.getpid)
+        self._slots = asyncio.Semaphore(self.processes)
+        self._batcher = asyncio.ensure_future(self._batch_requests())
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle, path)
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server.sockets[0].getsockname()
+
+    async def close(self):
+        self.server.close()
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self.server.wait_closed()
+        self._batcher.cancel()
+        self.pool.shutdown()
+
+    async def _handle(self, reader, writer):
+        pending = set()
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    request_id, kind, count = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                except asyncio.IncompleteReadError:
+                    break
+                if kind == METRICS:
+                    self._reply(writer, request_id, OK, json.dumps(self.metrics.as_dict()).encode())
+                    continue
+                if count > self.max_batch_points:
+                    # The points that follow cannot be skipped cheaply, so the
+                    # connection is closed after the error.
+                    self.metrics.requests += 1
+                    self.metrics.errors += 1
+                    self._reply(writer, request_id, ERROR, (
+                        'request of %d points exceeds the limit of %d' %
+                        (count, self.max_batch_points)).encode())
+                    break
+                data = await reader.readexactly(16 * count)
+                task = asyncio.ensure_future(self._answer(writer, request_id, count, data))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            await asyncio.gather(*pending)
+        finally:
+            del self._connections[asyncio.current_task()]
+            writer.close()
+
+    def _reply(self, writer, request_id, status, payload, count=None):
+        count = len(payload) if count is None else count
+        writer.write(_HEADER.pack(request_id, status, count) + payload)
+
+    async def _answer(self, writer, request_id, count, data):
+        started = time.perf_counter()
+        future = asyncio.get_event_loop().create_future()
+        self.metrics.queue_depth += 1
+        self.queue.put_nowait((count, data, future))
+        try:
+            ids = await future
+        except Exception as error:
+            self.metrics.errors += 1
+            self._reply(writer, request_id, ERROR, str(error).encode())
+        else:
+            self._reply(writer, request_id, OK, ids, len(ids) // 8)
+        self.metrics.requests += 1
+        self.metrics.latencies.append(time.perf_counter() - started)
+
+    async def _batch_requests(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            batch = [await self.queue.get()]
+            points = batch[0][0]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch and points < self.max_batch_points:
+                if self.queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self.queue.get_nowait())
+                points += batch[-1][0]
+            self.metrics.queue_depth -= len(batch)
+            await self._slots.acquire()
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        self.metrics.in_flight += 1
+        offsets = array('q', itertools.accumulate([0] + [count for count, _, _ in batch]))
+        try:
+            xs = b''.join(data[:8 * count] for count, data, _ in batch)
+            ys = b''.join(data[8 * count:] for count, data, _ in batch)
+            results = await asyncio.get_event_loop().run_in_executor(
+                self.pool, _hull_batch, xs, ys, offsets)
+        except Exception as error:
+            for _, _, future in batch:
+                future.set_exception(error)
+        else:
+            for (_, _, future), ids in zip(batch, results):
+                future.set_result(ids)
+        finally:
+            self.metrics.batches += 1
+            self.metrics.batched_points += offsets[-1]
+            self.metrics.in_flight -= 1
+            self._slots.release()
+
+
+class HullClient:
+    # Requests are pipelined over one connection; responses are matched
+    # back to their requests by id.
+
+    def __init__(self):
+        self.reader = self.writer = None
+        self.pending = {}
+        self._ids = itertools.count()
+        self._receiver = None
+        self._lost = None
+
+    async def connect(self, host='127.0.0.1', port=None, path=None):
+        if path is not None:
+            self.reader, self.writer = await asyncio.open_unix_connection(path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(host, port)
+        self._receiver = asyncio.ensure_future(self._receive())
+        return self
+
+    async def close(self):
+        self._receiver.cancel()
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def _receive(self):
+        try:
+            await self._receive_responses()
+        except (asyncio.IncompleteReadError, ConnectionError) as error:
+            self._lost = ConnectionError('connection lost: %s' % error)
+            for _, future in self.pending.values():
+                future.set_exception(self._lost)
+            self.pending.clear()
+
+    async def _receive_responses(self):
+        while True:
+            request_id, status, count = _HEADER.unpack(await self.reader.readexactly(_HEADER.size))
+            kind, future = self.pending.pop(request_id)
+            size = 8 * count if status == OK and kind == HULL else count
+            payload = await self.reader.readexactly(size)
+            if status == ERROR:
+                future.set_exception(RuntimeError(payload.decode()))
+            elif kind == HULL:
+                future.set_result(array('q', payload))
+            else:
+                future.set_result(json.loads(payload))
+
+    def _request(self, kind, count=0, payload=b''):
+        if self._lost is not None:
+            raise self._lost
+        request_id = next(self._ids)
+        future = asyncio.get_event_loop().create_future()
+        self.pending[request_id] = (kind, future)
+        self.writer.write(_HEADER.pack(request_id, kind, count) + payload)
+        return future
+
+    async def hull_indices(self, points):
+        if not isinstance(points, PointArray):
+            points = PointArray.from_points(points)
+        payload = array('d', points.xs).tobytes() + array('d', points.ys).tobytes()
+        return await self._request(HULL, len(points), payload)
+
+    async def hull(self, points):
+        if not isinstance(points, PointArray):
+            points = PointArray.from_points(points)
+        return [points[i] for i in await self.hull_indices(points)]
+
+    async def metrics(self):
+        return await self._request(METRICS)
+
+
+async def _serve(options):
+    server = HullServer(options.processes, options.max_batch, options.max_batch_points,
+                        options.max_delay)
+    address = await server.start(options.host, options.port, options.path)
+    print('listening on %s' % (address,))
+    await server.server.serve_forever()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Serve hull requests over TCP or a Unix socket.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--path', help='listen on this Unix socket instead')
+    parser.add_argument('--processes', type=int)
+    parser.add_argument('--max-batch', type=int)
+    parser.add_argument('--max-batch-points', type=int)
+    parser.add_argument('--max-delay', type=float, help='seconds to wait for a batch to fill')
+    asyncio.run(_serve(parser.parse_args(arguments)))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,30 +1,37 @@
-import plotly.offline as py
-from plotly.graph_objs import *
 from random import randint
-from quickhull import QuickHull, Point
 
-import networkx as nx
+from .quickhull import Point
+from .instrumentation import InstrumentedQuickHull
 
 
 class QuickHullAnimator:
     animation_speed = 1000
+    max_frames = 500
+    max_points = 5000
+    edges_per_trace = 256
 
-    def __init__(self, points):
+    def __init__(self, points, max_frames=None, max_points=None):
         self.points = points
-        self.quick_hull = QuickHull(self.points, self)
-        self.temp_edge_trace = self._get_temp_edge_trace()
-        self.done_edge_trace = self._get_done_edge_trace()
-        self.node_trace = self._get_node_trace()
-        self.selected_node_trace = self._get_selected_node_trace()
-        self._init_node_trace()
-        self.figure = {
-            'data': Data([self.temp_edge_trace, self.done_edge_trace, self.node_trace, self.selected_node_trace]),
+        self.quick_hull = InstrumentedQuickHull(self.points, self)
+        if max_frames is not None:
+            self.max_frames = max_frames
+        if max_points is not None:
+            self.max_points = max_points
+        # Every handler event is recorded as a small delta; frames are only
+        # materialised in draw(), after merging steps down to max_frames.
+        self.steps = []
+        self._create_frame("Initializing.")
+        self._create_frame("Initializing.")
+
+    def _create_figure(self, data):
+        figure = {
+            'data': data,
             'layout': {'showlegend': False}, 'frames': [],
         }
-        self.figure['layout']['xaxis'] = {'showgrid': False, 'zeroline': False, 'showticklabels': True}
-        self.figure['layout']['yaxis'] = {'showgrid': False, 'zeroline': False, 'showticklabels': True}
+        figure['layout']['xaxis'] = {'showgrid': False, 'zeroline': False, 'showticklabels': True}
+        figure['layout']['yaxis'] = {'showgrid': False, 'zeroline': False, 'showticklabels': True}
 
-        self.sliders_dict = {
+        sliders_dict = {
             'active': 0,
             'yanchor': 'top',
             'xanchor': 'left',
@@ -41,7 +48,7 @@ class QuickHullAnimator:
             'y': 0,
             'steps': []
         }
-        self.figure['layout']['updatemenus'] = [
+        figure['layout']['updatemenus'] = [
             {
                 'buttons': [
                     {
@@ -68,32 +75,16 @@ class QuickHullAnimator:
                 'yanchor': 'top'
             }
         ]
-        self.figure['layout']['sliders'] = {
-            'args': [
-                'transition', {
-                    'duration': self.animation_speed,
-                    'easing': 'cubic-in-out'
-                }
-            ],
-            'initialValue': '0',
-            'plotlycommand': 'animate',
-            'visible': True
-        }
-        self._create_frame("Initializing.")
-        self._create_frame("Initializing.")
-
-    def _init_node_trace(self):
-        for point in self.points:
-            self.node_trace['x'].append(point.x)
-            self.node_trace['y'].append(point.y)
+        figure['layout']['sliders'] = [sliders_dict]
+        return figure
 
     def _get_node_trace(self):
-        return Scatter(
+        return dict(
+            type='scatter',
             x=[],
             y=[],
-            text=[],
             mode='markers',
-            hoverinfo='text',
+            hoverinfo='none',
             marker=dict(
                 size=10,
                 color='rgb(142, 63, 56)',
@@ -104,12 +95,12 @@ class QuickHullAnimator:
         )
 
     def _get_selected_node_trace(self):
-        return Scatter(
+        return dict(
+            type='scatter',
             x=[],
             y=[],
-            text=[],
             mode='markers',
-            hoverinfo='text',
+            hoverinfo='none',
             marker=dict(
                 size=10,
                 color='rgb(77, 124, 213)',
@@ -120,7 +111,8 @@ class QuickHullAnimator:
         )
 
     def _get_temp_edge_trace(self):
-        return Scatter(
+        return dict(
+            type='scatter',
             x=[],
             y=[],
             line=dict(color=('rgb(22, 96, 167)'), width=0.5),
@@ -128,7 +120,8 @@ class QuickHullAnimator:
             mode='lines')
 
     def _get_done_edge_trace(self):
-        return Scatter(
+        return dict(
+            type='scatter',
             x=[],
             y=[],
             line=dict(
@@ -142,97 +135,118 @@ class QuickHullAnimator:
         to_trace['y'] = list(from_trace['y'])
         return to_trace
 
-    def _add_temp_edge(self, from_point, to_point, comment):
-        self.temp_edge_trace = self._copy_trace(self.temp_edge_trace, self._get_temp_edge_trace())
-        self.temp_edge_trace['x'] += [from_point.x, to_point.x, None]
-        self.temp_edge_trace['y'] += [from_point.y, to_point.y, None]
-        self._create_frame(comment)
+    def _sample(self, points, limit):
+        stride = -(-len(points) // limit)
+        return points[::stride] if stride > 1 else points
+
+    def _init_node_trace(self, node_trace):
+        # Large inputs only show a sample of the point cloud, the hull
+        # vertices are always kept.
+        points = self._sample(self.points, self.max_points) + \
+            self.quick_hull.hull()
+        for point in points:
+            node_trace['x'].append(point.x)
+            node_trace['y'].append(point.y)
+        return node_trace
+
+    def _create_frame(self, comment, change=None):
+        self.steps.append((comment, change))
+
+    def _frame_steps(self):
+        stride = -(-len(self.steps) // self.max_frames)
+        steps = set(range(stride - 1, len(self.steps), stride))
+        steps.add(len(self.steps) - 1)
+        return steps
+
+    def _build_figure(self):
+        # Edges go into fixed-size buckets, one trace each. A frame only
+        # carries the traces changed since the previous frame, so it never
+        # holds more than a few buckets plus the current selection.
+        temp_count = sum(1 for _, change in self.steps if change and change[0] == 'temp')
+        done_count = sum(1 for _, change in self.steps if change and change[0] == 'done')
+        temp_edge_traces = [self._get_temp_edge_trace()
+                            for _ in range(-(-temp_count // self.edges_per_trace))]
+        done_edge_traces = [self._get_done_edge_trace()
+                            for _ in range(-(-done_count // self.edges_per_trace))]
+        node_trace = self._init_node_trace(self._get_node_trace())
+        selected_node_trace = self._get_selected_node_trace()
+        traces = temp_edge_traces + done_edge_traces + [node_trace, selected_node_trace]
+        figure = self._create_figure([self._copy_trace(trace, dict(trace)) for trace in traces])
+        sliders_dict = figure['layout']['sliders'][0]
+
+        frame_steps = self._frame_steps()
+        counts = {'temp': 0, 'done': 0}
+        buckets = {'temp': (temp_edge_traces, 0), 'done': (done_edge_traces, len(temp_edge_traces))}
+        changed = set()
+        for step, (comment, change) in enumerate(self.steps):
+            if change and change[0] in buckets:
+                kind, from_point, to_point = change
+                bucket_traces, offset = buckets[kind]
+                bucket = counts[kind] // self.edges_per_trace
+                counts[kind] += 1
+                bucket_traces[bucket]['x'] += [from_point.x, to_point.x, None]
+                bucket_traces[bucket]['y'] += [from_point.y, to_point.y, None]
+                changed.add(offset + bucket)
+            elif change:
+                selected_node_trace['x'] = [point.x for point in change[1]]
+                selected_node_trace['y'] = [point.y for point in change[1]]
+                changed.add(len(traces) - 1)
+            if step not in frame_steps:
+                continue
+            changed = sorted(changed)
+            figure['frames'].append({'data': [self._copy_trace(traces[i], {}) for i in changed],
+                                     'traces': changed,
+                                     'name': len(sliders_dict['steps'])})
+            changed = set()
+            slider_step = {
+                'args': [
+                    [len(sliders_dict['steps'])],
+                    {'frame': {'duration': self.animation_speed, 'redraw': False},
+                     'mode': 'immediate',
+                     'transition': {'duration': self.animation_speed}}
+                ],
+                'label': comment,
+                'method': 'animate'
+            }
+            sliders_dict['steps'].append(slider_step)
+        return figure
 
-    def _remove_line_from_temp_edges(self, from_point, to_point, comment):
-        pass
-        # self.temp_edge_trace = self._copy_trace(self.temp_edge_trace, self._get_temp_edge_trace())
-        # for i in range(0, len(self.temp_edge_trace['x']), 3):
-        #     if self.temp_edge_trace['x'][i] == from_point.x and\
-        #         self.temp_edge_trace['x'][i + 1] == to_point.x and\
-        #         self.temp_edge_trace['y'][i] == from_point.y and\
-        #         self.temp_edge_trace['y'][i + 1] == to_point.y:
-        #         self.temp_edge_trace['x'] = self.temp_edge_trace['x'][:i] + [None, None, None] + self.temp_edge_trace['x'][i + 3:]
-        #         self.temp_edge_trace['y'] = self.temp_edge_trace['y'][:i] + [None, None, None] + self.temp_edge_trace['y'][i + 3:]
-        #         self._create_frame(comment)
-        #         return
-
-    def _add_done_edge(self, from_point, to_point, comment):
-        self.done_edge_trace = self._copy_trace(self.done_edge_trace, self._get_done_edge_trace())
-        self.done_edge_trace['x'] += [from_point.x, to_point.x, None]
-        self.done_edge_trace['y'] += [from_point.y, to_point.y, None]
-        self._create_frame(comment)
-
-    def _create_frame(self, comment):
-        self.figure['frames'].append({'data': Data([self.temp_edge_trace, self.done_edge_trace, self.node_trace, self.selected_node_trace]),
-                                      'name': len(self.sliders_dict['steps'])})
-        slider_step = {
-            'args': [
-                [len(self.sliders_dict['steps'])],
-                {'frame': {'duration': self.animation_speed, 'redraw': False},
-                'mode': 'immediate',
-                'transition': {'duration': self.animation_speed}}
-            ],
-            'label': comment,
-            'method': 'animate'
-        }
-        self.sliders_dict['steps'].append(slider_step)
+    def draw(self, **options):
+        # plotly is only needed once something is drawn; importing the
+        # package (or this module) must stay cheap.
+        import plotly.offline as py
 
-    def draw(self):
-        self.figure['layout']['sliders'] = [self.sliders_dict]
-        py.plot(self.figure)
+        self.figure = self._build_figure()
+        py.plot(self.figure, **options)
 
     def add_to_hull(self, begin, end):
-        self._add_done_edge(begin, end, "Add line to hull.")
+        self._create_frame("Add line to hull.", ('done', begin, end))
 
     def add_line(self, begin, end, comment):
-        self._add_temp_edge(begin, end, comment)
+        self._create_frame(comment, ('temp', begin, end))
 
     def remove_line(self, begin, end, comment):
-        self._remove_line_from_temp_edges(begin, end, comment)
+        pass
 
     def select_points(self, points, comment):
-        self.node_trace = self._copy_trace(self.node_trace, self._get_node_trace())
-        self.selected_node_trace = self._copy_trace(self.selected_node_trace, self._get_selected_node_trace())
-        # node_xs = []
-        # node_ys = []
-        # for i in range(len(self.node_trace['x'])):
-        #     found = False
-        #     for j in range(len(points)):
-        #         if self.node_trace['x'][i] == points[j].x and self.node_trace['y'][i] == points[j].y:
-        #             found = True
-        #             break
-        #     if not found:
-        #         node_xs.append(self.node_trace['x'][i])
-        #         node_ys.append(self.node_trace['y'][i])
-        #     else:
-        #         node_xs.append(0)
-        #         node_ys.append(-20000)
-        # self.node_trace['x'] = node_xs
-        # self.node_trace['y'] = node_ys
-        for j in range(len(points)):
-            self.selected_node_trace['x'].append(points[j].x)
-            self.selected_node_trace['y'].append(points[j].y)
-        self._create_frame(comment)
+        self._create_frame(comment, ('select', self._sample(points, self.max_points)))
 
     def deselect_points(self):
-        self.selected_node_trace = self._get_selected_node_trace()
-        self.node_trace = self._get_node_trace()
-        self._init_node_trace()
-        self._create_frame("")
+        self._create_frame("", ('select', []))
+
+
+def _demo():
+    points = []
+    for node in range(100):
+        x, y = randint(-10000, 10000), randint(-10000, 10000)
+        points.append(Point(x, y))
 
+    animator = QuickHullAnimator(points)
 
-points = []
-for node in range(100):
-    x, y = randint(-10000, 10000), randint(-10000, 10000)
-    points.append(Point(x, y))
+    animator.quick_hull.calculate()
 
-animator = QuickHullAnimator(points)
+    animator.draw()
 
-animator.quick_hull.calculate()
 
-animator.draw()
+if __name__ == '__main__':
+    _demo()
@@ -0,0 +1,110 @@
+from bisect import bisect_left
+from collections import deque
+
+from .online import OnlineHull, _cross
+from .quickhull import Point
+
+
+class _UndoableHull(OnlineHull):
+    # OnlineHull whose insertions can be undone, newest first. Every chain
+    # update is logged as the slice it replaced.
+
+    def __init__(self):
+        OnlineHull.__init__(self)
+        self.log = []
+
+    def _insert_chain(self, chain, point, sign):
+        i = bisect_left(chain, point)
+        if i < len(chain) and chain[i] == point or \
+                0 < i < len(chain) and sign * _cross(chain[i - 1], chain[i], point) >= 0:
+            self.log.append(None)
+            return False
+        begin = i
+        while begin >= 2 and sign * _cross(chain[begin - 2], chain[begin - 1], point) <= 0:
+            begin -= 1
+        end = i
+        while end + 1 < len(chain) and sign * _cross(point, chain[end], chain[end + 1]) <= 0:
+            end += 1
+        self.log.append((chain, begin, chain[begin:end]))
+        chain[begin:end] = [point]
+        return True
+
+    def pop(self):
+        self.size -= 1
+        for _ in range(2):
+            entry = self.log.pop()
+            if entry is not None:
+                chain, begin, replaced = entry
+                chain[begin:begin + 1] = replaced
+
+
+def _merge(*chains):
+    # Monotone chain over the vertices of a few hulls, in QuickHull order.
+    vertices = sorted(set(vertex for chain in chains for vertex in chain))
+    if len(vertices) < 2:
+        # Every point is the same one; like OnlineHull, a single vertex.
+        return [Point(x, y) for x, y in vertices]
+    lower, upper = [], []
+    for point in vertices:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+    for point in reversed(vertices):
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+    vertices = lower[:-1] + upper[:-1]
+    lowest = min(range(len(vertices)), key=lambda i: (vertices[i][1], vertices[i][0]))
+    return [Point(x, y) for x, y in vertices[lowest:] + vertices[:lowest]]
+
+
+class SlidingWindowHull:
+    # Two-stack queue of hulls. New points go into an OnlineHull (the back
+    # stack); evictions undo insertions on the front stack, which is rebuilt
+    # from the back one, newest point first, whenever it runs empty. Every
+    # point is inserted and undone at most twice, so updates cost amortised
+    # O(log h) plus list shifting, and hull() merges the two hulls in
+    # O(h log h).
+
+    def __init__(self, window=None):
+        self.window = window
+        self.points = deque()
+        self.front = _UndoableHull()
+        self.back = OnlineHull()
+
+    def __len__(self):
+        return len(self.points)
+
+    @property
+    def hull_size(self):
+        return len(self.hull())
+
+    def append(self, point, time=None):
+        # With a window length set, points stamped at or before
+        # time - window are evicted first.
+        if self.window is not None and time is not None:
+            self.expire(time - self.window)
+        self.points.append((time, point))
+        self.back.insert(point)
+
+    def evict(self):
+        if not self.points:
+            raise IndexError('evict from an empty window')
+        if self.front.size == 0:
+            self.front = _UndoableHull()
+            for _, point in reversed(self.points):
+                self.front.insert(point)
+            self.back = OnlineHull()
+        self.front.pop()
+        return self.points.popleft()[1]
+
+    def expire(self, time):
+        # Evicts every point stamped at or before time.
+        while self.points and self.points[0][0] is not None and self.points[0][0] <= time:
+            self.evict()
+
+    def hull(self):
+        if len(self.points) < 3:
+            # Like QuickHull, fewer than three points are returned as given.
+            return [point for _, point in self.points]
+        return _merge(self.front.lower, self.front.upper, self.back.lower, self.back.upper)
@@ -0,0 +1,65 @@
+import glob
+import os
+import random
+from fractions import Fraction
+
+from quickhull import Point
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      'quickhull', 'tests')
+
+
+def corpus_files(corpus, files=5):
+    paths = glob.glob(os.path.join(CORPUS, corpus, '*.txt'))
+    return sorted(paths, key=lambda path: int(os.path.basename(path)[:-4]))[:files]
+
+
+def cross(o, a, b):
+    # Exact orientation, kept independent of quickhull.predicates.
+    ox, oy, ax, ay, bx, by = map(Fraction, (o[0], o[1], a[0], a[1], b[0], b[1]))
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+def tuples(points):
+    return [(point.x, point.y) for point in points]
+
+
+def reference_hull(points):
+    # Strictly convex vertices in QuickHull order: counter-clockwise,
+    # starting at the lowest point (the leftmost of those).
+    points = sorted(set(points))
+    if len(points) < 3:
+        return points
+    lower, upper = [], []
+    for point in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+    for point in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+    vertices = lower[:-1] + upper[:-1]
+    lowest = min(range(len(vertices)), key=lambda i: (vertices[i][1], vertices[i][0]))
+    return vertices[lowest:] + vertices[:lowest]
+
+
+def inside(vertices, point):
+    # Boundary included; vertices counter-clockwise.
+    if len(vertices) < 3:
+        return point in vertices
+    return all(cross(vertices[i], vertices[(i + 1) % len(vertices)], point) >= 0
+               for i in range(len(vertices)))
+
+
+def random_points(seed, size, scale=100.0):
+    generator = random.Random(seed)
+    return [Point(generator.uniform(-scale, scale), generator.uniform(-scale, scale))
+            for _ in range(size)]
+
+
+def grid_points(seed, size, radius):
+    # Small integer grids: plenty of duplicates and collinear points.
+    generator = random.Random(seed)
+    return [Point(generator.randint(-radius, radius), generator.randint(-radius, radius))
+            for _ in range(size)]
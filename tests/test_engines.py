@@ -0,0 +1,105 @@
+from array import array
+
+import numpy as np
+import pytest
+
+from quickhull import (ChanHull, MonotoneChainHull, NumpyQuickHull, ParallelQuickHull, Point,
+                       PointArray, QuickHull, batch_hull, convex_hull)
+from quickhull.generator import generate
+
+from . import grid_points, random_points, reference_hull, tuples
+
+
+def _ordered(points):
+    # The full permutation QuickHull leaves behind, hull first.
+    hull = QuickHull(points)
+    hull.calculate()
+    points = hull.points
+    return [(points.xs[i], points.ys[i]) for i in hull.indices], hull.hull_size
+
+
+def _numpy_ordered(points):
+    hull = NumpyQuickHull(PointArray.from_points(points))
+    hull.calculate()
+    return [tuple(row) for row in hull.points.tolist()], hull.hull_size
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_numpy_matches_quickhull_order(seed):
+    points = random_points(seed, 20 + 100 * seed)
+    assert _numpy_ordered(points) == _ordered(points)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_numpy_matches_quickhull_order_on_grids(seed):
+    points = grid_points(seed, 60, 4)
+    assert _numpy_ordered(points) == _ordered(points)
+
+
+@pytest.mark.parametrize('distribution', ['collinear', 'duplicates', 'circle'])
+def test_numpy_matches_quickhull_order_on_degenerate_input(distribution):
+    points = generate(distribution, 300, seed=5)
+    points = [Point(x, y) for x, y in zip(points.xs, points.ys)]
+    assert _numpy_ordered(points) == _ordered(points)
+    line = [Point(x, 2 * x) for x in range(-20, 20)]
+    assert _numpy_ordered(line) == _ordered(line)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_parallel_stitching(seed):
+    points = random_points(seed, 5000)
+    hull = ParallelQuickHull(points, processes=2, threshold=200)
+    hull.calculate()
+    assert tuples(hull.hull()) == reference_hull(tuples(points))
+
+
+@pytest.mark.parametrize('processes', [2, 3])
+def test_parallel_matches_quickhull(processes):
+    # Small thresholds split the root and its children across the pool.
+    # Ranges split that way keep their points in another order, so of
+    # repeated points a different copy may end up on the hull.
+    inputs = [random_points(11, 3000), grid_points(12, 3000, 6),
+              [Point(-1.0, -200.0)] * 5 + random_points(13, 3000)]
+    points = generate('circle', 3000, seed=14)
+    inputs.append([Point(x, y) for x, y in zip(points.xs, points.ys)])
+    for points in inputs:
+        hull = ParallelQuickHull(points, processes=processes, threshold=50)
+        hull.calculate()
+        assert sorted(hull.indices) == list(range(len(points)))
+        serial = QuickHull(points)
+        serial.calculate()
+        assert tuples(hull.hull()) == tuples(serial.hull())
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_batch_ids_are_rebased(processes):
+    sets = [random_points(seed, size) for seed, size in enumerate([1, 2, 30, 200, 0, 70, 500])]
+    points = [point for points in sets for point in points]
+    offsets = [0]
+    for points_of_set in sets:
+        offsets.append(offsets[-1] + len(points_of_set))
+    hull_offsets, hull_indices = batch_hull(points, offsets, processes=processes, chunk_size=100)
+    assert len(hull_offsets) == len(sets) + 1
+    for k, points_of_set in enumerate(sets):
+        hull = QuickHull(points_of_set)
+        hull.calculate()
+        expected = array('q', [i + offsets[k] for i in hull.indices[:hull.hull_size]])
+        assert hull_indices[hull_offsets[k]:hull_offsets[k + 1]] == expected
+
+
+@pytest.mark.parametrize('engine', [MonotoneChainHull, ChanHull])
+def test_other_engines(engine):
+    for seed in range(5):
+        points = random_points(seed, 50 + 400 * seed)
+        hull = engine(points)
+        hull.calculate()
+        assert tuples(hull.hull()) == reference_hull(tuples(points))
+    points = generate('circle', 2000, seed=1)
+    assert tuples(convex_hull(points).hull()) == reference_hull(tuples(points[:]))
+
+
+def test_numpy_hull_matches_reference():
+    points = random_points(7, 1000)
+    hull = NumpyQuickHull(np.array(tuples(points)))
+    hull.calculate()
+    assert [tuple(row) for row in hull.hull().tolist()] == reference_hull(tuples(points))
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from quickhull import OnlineHull, Point, SlidingWindowHull
+
+from . import grid_points, random_points, reference_hull, tuples
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_online_matches_recompute(seed):
+    points = random_points(seed, 300) + grid_points(seed, 100, 5)
+    random.Random(seed).shuffle(points)
+    hull = OnlineHull()
+    for size, point in enumerate(points, 1):
+        hull.insert(point)
+        if size >= 3 and size % 37 == 0:
+            assert tuples(hull.hull()) == reference_hull(tuples(points[:size]))
+    assert tuples(hull.hull()) == reference_hull(tuples(points))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_window_matches_recompute(seed):
+    points = random_points(seed, 400) + grid_points(seed, 100, 3)
+    window = SlidingWindowHull(window=50)
+    for time, point in enumerate(points):
+        window.append(point, time)
+        current = points[max(0, time - 49):time + 1]
+        assert len(window) == len(current)
+        if len(current) >= 3 and time % 7 == 0:
+            assert tuples(window.hull()) == reference_hull(tuples(current))
+
+
+def test_window_evict():
+    points = random_points(3, 120)
+    window = SlidingWindowHull()
+    for point in points:
+        window.append(point)
+    for first in range(len(points) - 3):
+        assert window.evict() == points[first]
+        if first % 5 == 0:
+            assert tuples(window.hull()) == reference_hull(tuples(points[first + 1:]))
+
+
+def test_window_of_identical_points():
+    window = SlidingWindowHull()
+    for _ in range(5):
+        window.append(Point(1.0, 2.0))
+    assert tuples(window.hull()) == [(1.0, 2.0)]
+    assert window.hull_size == 1
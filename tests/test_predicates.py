@@ -0,0 +1,60 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from quickhull import Point, QuickHull, predicates
+from quickhull.numpy_quickhull import orientations
+from quickhull.pointfile import read_text
+from quickhull.predicates import orientation
+
+from . import corpus_files
+
+STEP = 2.0 ** -53
+
+
+def _sign(value):
+    return int(value > 0) - int(value < 0)
+
+
+def _exact(bx, by, ex, ey, x, y):
+    bx, by, ex, ey, x, y = map(Fraction, (bx, by, ex, ey, x, y))
+    return (bx - x) * (ey - y) - (ex - x) * (by - y)
+
+
+def _grid(size=64):
+    # Shewchuk's test: points 0.5 + k * 2**-53 around the line from (12, 12)
+    # to (24, 24); almost every naive determinant there has the wrong sign.
+    return [(0.5 + i * STEP, 0.5 + j * STEP) for i in range(size) for j in range(size)]
+
+
+@pytest.mark.parametrize('line', [(12.0, 12.0, 24.0, 24.0), (24.0, 24.0, 12.0, 12.0),
+                                  (0.5, 0.5, 12.0, 12.0), (-3.0, -3.0, 17.0, 17.0)])
+def test_orientation_near_collinear(line):
+    for x, y in _grid():
+        assert _sign(orientation(*line, x, y)) == _sign(_exact(*line, x, y))
+
+
+@pytest.mark.parametrize('line', [(12.0, 12.0, 24.0, 24.0), (0.5, 0.5, 12.0, 12.0)])
+def test_orientations_near_collinear(line):
+    grid = _grid()
+    xs = np.array([x for x, _ in grid])
+    ys = np.array([y for _, y in grid])
+    expected = [_sign(_exact(*line, x, y)) for x, y in grid]
+    assert np.sign(orientations(*line, xs, ys)).tolist() == expected
+    # Scalars broadcast the same way.
+    assert [_sign(orientations(*line, np.float64(x), np.float64(y)))
+            for x, y in grid[:200]] == expected[:200]
+
+
+def test_integer_coordinates_stay_exact():
+    points = [Point(i, 2 * i) for i in range(2000)]
+    hull = QuickHull(points)
+    assert hull.points.xs.typecode == 'q'
+    exact = predicates.stats.exact
+    hull.calculate()
+    assert predicates.stats.exact == exact
+    for path in corpus_files('1000', 2):
+        assert read_text(path).xs.typecode == 'q'
+    assert QuickHull([Point(0.5, 1), Point(2, 3)]).points.xs.typecode == 'd'
+    assert QuickHull([Point(2 ** 70, 1), Point(2, 3)]).points.xs.typecode == 'd'
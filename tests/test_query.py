@@ -0,0 +1,118 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from quickhull import (HullIndex, Point, QuickHull, area, batch_hull, batch_metrics, diameter,
+                       minimum_rectangle, perimeter)
+
+from . import cross, grid_points, inside, random_points, reference_hull, tuples
+
+
+def _vertices(seed, size=300):
+    return [Point(x, y) for x, y in reference_hull(tuples(random_points(seed, size)))]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_contains(seed):
+    vertices = _vertices(seed)
+    index = HullIndex(vertices)
+    # Vertices, edge midpoints and points all around.
+    queries = random_points(seed + 100, 500, scale=120.0) + vertices + \
+        [Point((a.x + b.x) / 2, (a.y + b.y) / 2) for a, b in zip(vertices, vertices[1:])]
+    expected = [inside(tuples(vertices), (point.x, point.y)) for point in queries]
+    assert [index.contains(point) for point in queries] == expected
+    xs = np.array([point.x for point in queries])
+    ys = np.array([point.y for point in queries])
+    assert index.contains_all(xs, ys, chunk_size=64).tolist() == expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_extreme(seed):
+    vertices = _vertices(seed)
+    index = HullIndex(vertices)
+    for angle in np.linspace(0, 2 * math.pi, 97):
+        dx, dy = math.cos(angle), math.sin(angle)
+        found = vertices[index.extreme(dx, dy)]
+        assert found.x * dx + found.y * dy == max(v.x * dx + v.y * dy for v in vertices)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_tangents(seed):
+    vertices = _vertices(seed)
+    index = HullIndex(vertices)
+    for point in random_points(seed + 200, 200, scale=300.0):
+        if inside(tuples(vertices), (point.x, point.y)):
+            continue
+        for tangent in index.tangents(point):
+            origin = (point.x, point.y)
+            through = (vertices[tangent].x, vertices[tangent].y)
+            sides = [cross(origin, through, (v.x, v.y)) for v in vertices]
+            assert all(side >= 0 for side in sides) or all(side <= 0 for side in sides)
+
+
+def _brute_diameter(vertices):
+    return max(math.hypot(a.x - b.x, a.y - b.y) for a, b in itertools.combinations(vertices, 2))
+
+
+def _brute_rectangle(vertices):
+    # Minimum over the hull edges of the enclosing rectangle resting on it.
+    best = math.inf
+    for a, b in zip(vertices, vertices[1:] + vertices[:1]):
+        length = math.hypot(b.x - a.x, b.y - a.y)
+        ux, uy = (b.x - a.x) / length, (b.y - a.y) / length
+        along = [v.x * ux + v.y * uy for v in vertices]
+        across = [v.y * ux - v.x * uy for v in vertices]
+        best = min(best, (max(along) - min(along)) * (max(across) - min(across)))
+    return best
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_metrics(seed):
+    vertices = _vertices(seed, 50 + 200 * seed)
+    assert area(vertices) == pytest.approx(
+        sum(cross((0, 0), (a.x, a.y), (b.x, b.y))
+            for a, b in zip(vertices, vertices[1:] + vertices[:1])) / 2)
+    assert perimeter(vertices) == pytest.approx(
+        sum(math.hypot(b.x - a.x, b.y - a.y) for a, b in zip(vertices, vertices[1:] + vertices[:1])))
+    distance, i, j = diameter(vertices)
+    assert distance == pytest.approx(_brute_diameter(vertices))
+    assert math.hypot(vertices[i].x - vertices[j].x, vertices[i].y - vertices[j].y) == distance
+    rectangle, corners = minimum_rectangle(vertices)
+    assert rectangle == pytest.approx(_brute_rectangle(vertices))
+    assert len(corners) == 4
+
+
+def test_degenerate_metrics():
+    line = [Point(0.0, 0.0), Point(3.0, 4.0)]
+    assert diameter(line)[0] == 5.0
+    assert minimum_rectangle(line)[0] == pytest.approx(0.0, abs=1e-12)
+    single = [Point(1.0, 1.0)]
+    assert diameter(single)[0] == 0.0
+    assert minimum_rectangle(single)[0] == 0.0
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_batch_metrics_match_scalar(seed):
+    sets = [random_points(seed * 10 + k, size) for k, size in enumerate([1, 2, 3, 40, 300])] + \
+        [grid_points(seed * 10 + k, 30, 2) for k in range(5)]
+    points = [point for points in sets for point in points]
+    offsets = [0]
+    for points_of_set in sets:
+        offsets.append(offsets[-1] + len(points_of_set))
+    hull_offsets, hull_indices = batch_hull(points, offsets, processes=1)
+    areas, perimeters, diameters, rectangles = batch_metrics(points, hull_offsets, hull_indices)
+    for k in range(len(sets)):
+        vertices = [points[i] for i in hull_indices[hull_offsets[k]:hull_offsets[k + 1]]]
+        hull = QuickHull(sets[k])
+        hull.calculate()
+        assert vertices == [sets[k][i] for i in hull.indices[:hull.hull_size]]
+        if tuples(vertices) != reference_hull(tuples(sets[k])):
+            # QuickHull can leave a repeated point on the hull of a grid;
+            # the metrics only promise results for convex hulls.
+            continue
+        assert areas[k] == pytest.approx(area(vertices), abs=1e-9)
+        assert perimeters[k] == pytest.approx(perimeter(vertices), abs=1e-9)
+        assert diameters[k] == pytest.approx(diameter(vertices)[0], abs=1e-9)
+        assert rectangles[k] == pytest.approx(minimum_rectangle(vertices)[0], abs=1e-9)
@@ -0,0 +1,87 @@
+import pytest
+
+from quickhull import InstrumentedQuickHull, Point, QuickHull
+from quickhull.generator import generate
+from quickhull.pointfile import read_text
+
+from . import corpus_files, grid_points, inside, random_points, reference_hull, tuples
+
+
+def _hull(points, **options):
+    hull = QuickHull(points, **options)
+    hull.calculate()
+    return tuples(hull.hull())
+
+
+@pytest.mark.parametrize('corpus', ['3', '10', '100', '1000'])
+def test_corpus(corpus):
+    for path in corpus_files(corpus):
+        points = read_text(path)
+        assert _hull(points) == reference_hull(tuples(points[:])), path
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_random(seed):
+    points = random_points(seed, 10 + 50 * seed)
+    assert _hull(points) == reference_hull(tuples(points))
+    assert _hull(points, prefilter=True) == reference_hull(tuples(points))
+
+
+def test_fewer_than_three_points():
+    for size in range(3):
+        points = [Point(size - i, i) for i in range(size)]
+        assert _hull(points) == tuples(points)
+
+
+def test_circle():
+    points = generate('circle', 500, seed=3)
+    assert _hull(points) == reference_hull(tuples(points[:]))
+
+
+@pytest.mark.parametrize('distribution', ['collinear', 'duplicates'])
+def test_degenerate(distribution):
+    # Like the original implementation, QuickHull may miss vertices on long
+    # collinear runs and repeated lowest points; it must still finish and
+    # only return input points.
+    points = generate(distribution, 500, seed=3)
+    vertices = _hull(points)
+    assert 0 < len(vertices) and set(vertices) <= set(tuples(points[:]))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_grid(seed):
+    points = grid_points(seed, 40, 3)
+    vertices = _hull(points)
+    expected = reference_hull(tuples(points))
+    assert set(expected) <= set(vertices) <= set(tuples(points))
+
+
+@pytest.mark.parametrize('prefilter', [False, True])
+def test_repeated_runs(prefilter):
+    points = random_points(4, 50)
+    expected = reference_hull(tuples(points))
+    hull = QuickHull(points, prefilter=prefilter)
+    hull.calculate()
+    assert tuples(hull.vertices()) == expected
+    assert tuples(edge[0] for edge in hull.edges()) == expected
+    hull.calculate()
+    assert hull.hull_size == len(expected) and tuples(hull.hull()) == expected
+
+    hull = QuickHull(points, prefilter=prefilter)
+    assert tuples(hull.vertices()) == expected
+    hull.calculate()
+    assert tuples(hull.hull()) == expected
+    # A run abandoned halfway is started again.
+    hull = QuickHull(points, prefilter=prefilter)
+    next(hull.vertices())
+    assert tuples(hull.vertices()) == expected
+
+
+def test_instrumented_hull():
+    points = random_points(9, 400)
+    hull = InstrumentedQuickHull(points, None)
+    hull.calculate()
+    assert tuples(hull.hull()) == reference_hull(tuples(points))
+    assert hull.stats.orientation_tests >= len(points) and hull.stats.swaps > 0
+    with pytest.raises(TypeError):
+        QuickHull(points, None)